@@ -5,6 +5,7 @@ This agent transforms good blogs into exceptional ones based on feedback.
 
 import json
 import logging
+from typing import Optional
 
 from crewai import Agent
 
@@ -28,11 +29,7 @@ def get_blog_alchemist_prompt(blog_content: str, review_feedback: str, style_gui
         str: The formatted prompt string.
     """
     return f"""
-    Transform this blog post based on the reviewer's feedback to make it more engaging and authentic.
-
-    Original Blog: {blog_content}
-    Review Feedback: {review_feedback}
-    Style Guide: {style_guide}
+    Transform the blog post given at the end of this prompt based on the reviewer's feedback to make it more engaging and authentic.
 
     Enhancement Focus:
     1. Address all high-priority improvement areas
@@ -58,15 +55,23 @@ def get_blog_alchemist_prompt(blog_content: str, review_feedback: str, style_gui
     - Target word count (600-800 words)
 
     OUTPUT: Enhanced blog post in markdown format that addresses all feedback while maintaining authenticity.
+
+    Style Guide: {style_guide}
+    Review Feedback: {review_feedback}
+    Original Blog: {blog_content}
     """
 
-def get_blog_alchemist_agent() -> Agent:
+def get_blog_alchemist_agent(verbose: Optional[bool] = None) -> Agent:
     """
     Initializes and returns the Content Enhancement Specialist Agent.
 
     This agent is an expert in content optimization, adding the perfect
     touches to make blogs irresistibly engaging.
 
+    Args:
+        verbose: Whether CrewAI logs the agent's steps. Defaults to whether debug
+            logging is enabled when the agent is built.
+
     Returns:
         Agent: The configured Blog Alchemist Agent.
     """
@@ -86,7 +91,7 @@ def get_blog_alchemist_agent() -> Agent:
                 "the perfect touches to make blogs irresistibly engaging."
             ),
             llm=ai_client.get_llm(),
-            verbose=True,
+            verbose=logger.isEnabledFor(logging.DEBUG) if verbose is None else verbose,
             allow_delegation=False,
         )
         logger.debug("Blog Alchemist Agent initialized successfully.")
@@ -5,6 +5,7 @@ This agent writes engaging technical blogs combining storytelling with practical
 
 import json
 import logging
+from typing import Optional
 
 from crewai import Agent
 
@@ -28,11 +29,8 @@ def get_blog_craftsman_prompt(story_blueprint: str, style_guide: str, topic_deta
         str: The formatted prompt string.
     """
     return f"""
-    Write a complete technical blog post using the provided story blueprint and style guide.
+    Write a complete technical blog post using the story blueprint and style guide given at the end of this prompt.
 
-    Story Blueprint: {story_blueprint}
-    Style Guide: {style_guide}
-    Topic Details: {topic_details}
     Target Length: 600-800 words (2-3 minute read)
 
     Writing Requirements:
@@ -60,15 +58,23 @@ def get_blog_craftsman_prompt(story_blueprint: str, style_guide: str, topic_deta
     - Focus on helping junior/mid-level developers
 
     OUTPUT: Complete blog post in markdown format with proper headings, code blocks, and formatting.
+
+    Style Guide: {style_guide}
+    Topic Details: {topic_details}
+    Story Blueprint: {story_blueprint}
     """
 
-def get_blog_craftsman_agent() -> Agent:
+def get_blog_craftsman_agent(verbose: Optional[bool] = None) -> Agent:
     """
     Initializes and returns the Technical Blog Writer Agent.
 
     This agent is known for making complex topics accessible through
     personal stories and clear examples in blog posts.
 
+    Args:
+        verbose: Whether CrewAI logs the agent's steps. Defaults to whether debug
+            logging is enabled when the agent is built.
+
     Returns:
         Agent: The configured Blog Craftsman Agent.
     """
@@ -88,7 +94,7 @@ def get_blog_craftsman_agent() -> Agent:
                 "topics accessible through personal stories and clear examples."
             ),
             llm=ai_client.get_llm(),
-            verbose=True,
+            verbose=logger.isEnabledFor(logging.DEBUG) if verbose is None else verbose,
             allow_delegation=False,
         )
         logger.debug("Blog Craftsman Agent initialized successfully.")
@@ -5,6 +5,7 @@ This agent ensures blogs are authentic, engaging, and valuable for the target au
 
 import json
 import logging
+from typing import Any, Optional
 
 from crewai import Agent
 
@@ -28,11 +29,8 @@ def get_blog_critic_prompt(blog_content: str, profile_data: str, style_guide: st
         str: The formatted prompt string.
     """
     return f"""
-    Review this technical blog post with the critical eye of a popular tech blogger.
+    Review the technical blog post given at the end of this prompt with the critical eye of a popular tech blogger.
 
-    Blog Post: {blog_content}
-    Author's LinkedIn Profile: {profile_data}
-    Style Guide: {style_guide}
     Target Audience: Junior to mid-level developers
 
     Evaluate the blog using these criteria:
@@ -91,26 +89,39 @@ def get_blog_critic_prompt(blog_content: str, profile_data: str, style_guide: st
     }}
 
     IMPORTANT: Return ONLY the JSON object, no markdown formatting or additional text.
+
+    Author's LinkedIn Profile: {profile_data}
+    Style Guide: {style_guide}
+    Blog Post: {blog_content}
     """
 
-def get_blog_critic_agent() -> Agent:
+def get_blog_critic_agent(llm: Optional[Any] = None, verbose: Optional[bool] = None) -> Agent:
     """
     Initializes and returns the Blog Quality Reviewer Agent.
 
     This agent is a seasoned editor with a keen eye for authenticity and
     engagement, ensuring technical blogs go viral.
 
+    Args:
+        llm: Model to review with. Defaults to GPT-4; other models are passed in to
+            build independent critics for a review panel.
+        verbose: Whether CrewAI logs the agent's steps. Defaults to whether debug
+            logging is enabled when the agent is built.
+
     Returns:
         Agent: The configured Blog Critic Agent.
     """
     try:
-        # Initialize LLM client specific to this agent
-        gpt4_client = DualModelChatClient(
-            reasoning_model="gpt-4",
-            concept_model="gpt-3.5-turbo",
-            default_model="reasoning",
-        )
-        blog_critic_llm = gpt4_client.get_llm(model_type="reasoning")
+        if llm is not None:
+            blog_critic_llm = llm
+        else:
+            # Initialize LLM client specific to this agent
+            gpt4_client = DualModelChatClient(
+                reasoning_model="gpt-4",
+                concept_model="gpt-3.5-turbo",
+                default_model="reasoning",
+            )
+            blog_critic_llm = gpt4_client.get_llm(model_type="reasoning")
 
         agent = Agent(
             role="Blog Quality Reviewer",
@@ -120,7 +131,7 @@ def get_blog_critic_agent() -> Agent:
                 "go viral. You have a keen eye for authenticity and engagement."
             ),
             llm=blog_critic_llm,
-            verbose=True,
+            verbose=logger.isEnabledFor(logging.DEBUG) if verbose is None else verbose,
             allow_delegation=False,
         )
         logger.debug("Blog Critic Agent initialized successfully.")
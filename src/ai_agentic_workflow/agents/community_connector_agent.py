@@ -5,6 +5,7 @@ This agent connects blog content to broader community resources and discussions.
 
 import json
 import logging
+from typing import Optional
 
 from crewai import Agent
 
@@ -27,10 +28,8 @@ def get_community_connector_prompt(blog_content: str, topic: str) -> str:
         str: The formatted prompt string.
     """
     return f"""
-    Enhance this blog post with community connections and additional resources.
+    Enhance the blog post given at the end of this prompt with community connections and additional resources.
 
-    Blog Post: {blog_content}
-    Topic: {topic}
     Target Audience: Junior to mid-level developers
 
     Your tasks:
@@ -71,16 +70,23 @@ def get_community_connector_prompt(blog_content: str, topic: str) -> str:
         "community_tags": ["#tag1", "#tag2"],
         "related_topics": ["topic1", "topic2"]
     }}
+
+    Topic: {topic}
+    Blog Post: {blog_content}
     """
 
 
-def get_community_connector_agent() -> Agent:
+def get_community_connector_agent(verbose: Optional[bool] = None) -> Agent:
     """
     Initializes and returns the Resource Curator Agent.
 
     This agent is a community builder who knows where developers learn and
     discuss topics, always ready with relevant resources.
 
+    Args:
+        verbose: Whether CrewAI logs the agent's steps. Defaults to whether debug
+            logging is enabled when the agent is built.
+
     Returns:
         Agent: The configured Community Connector Agent.
     """
@@ -101,7 +107,7 @@ def get_community_connector_agent() -> Agent:
                 "and discuss topics, always ready with the perfect resources."
             ),
             llm=community_connector_llm,
-            verbose=True,
+            verbose=logger.isEnabledFor(logging.DEBUG) if verbose is None else verbose,
             allow_delegation=False,
         )
         logger.debug("Community Connector Agent initialized successfully.")
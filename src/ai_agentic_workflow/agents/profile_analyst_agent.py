@@ -3,6 +3,7 @@ Defines the LinkedIn Profile Analyst Agent for the blog creation workflow.
 This agent extracts expertise and story potential from professional experience.
 """
 import logging
+from typing import Optional
 
 from crewai import Agent
 from crewai import Task, Crew, Process
@@ -109,10 +110,7 @@ def get_profile_analyst_prompt(profile_data: str) -> str:
         str: The formatted prompt string.
     """
     return f"""
-    Analyze the following LinkedIn profile data to extract expertise and potential story narratives:
-
-    Profile Data:
-    {profile_data}
+    Analyze the LinkedIn profile data given at the end of this prompt to extract expertise and potential story narratives.
 
     Your task:
     1. Identify all technical skills and years of experience with each
@@ -145,15 +143,22 @@ def get_profile_analyst_prompt(profile_data: str) -> str:
     }}
 
     IMPORTANT: Return ONLY the JSON object, no markdown formatting or additional text.
+
+    Profile Data:
+    {profile_data}
     """
 
-def get_profile_analyst_agent() -> Agent:
+def get_profile_analyst_agent(verbose: Optional[bool] = None) -> Agent:
     """
     Initializes and returns the LinkedIn Profile Analyst Agent.
 
     This agent is responsible for analyzing LinkedIn profiles to identify
     compelling narratives and technical expertise suitable for blog content.
 
+    Args:
+        verbose: Whether CrewAI logs the agent's steps. Defaults to whether debug
+            logging is enabled when the agent is built.
+
     Returns:
         Agent: The configured Profile Analyst Agent.
     """
@@ -175,7 +180,7 @@ def get_profile_analyst_agent() -> Agent:
                 "transformed into engaging blog content."
             ),
             llm=profile_analyst_llm,
-            verbose=True,
+            verbose=logger.isEnabledFor(logging.DEBUG) if verbose is None else verbose,
             allow_delegation=False,
         )
         logger.debug("Profile Analyst Agent initialized successfully.")
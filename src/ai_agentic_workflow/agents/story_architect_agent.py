@@ -5,6 +5,7 @@ This agent crafts compelling story structures combining personal experience with
 
 import json
 import logging
+from typing import Optional
 
 from crewai import Agent
 
@@ -69,17 +70,9 @@ Now, write the ~900-word blog post. Embody the expert's voice and meticulously f
     **4. The Takeaway & The Path Forward:**
     *   Bring the story to a satisfying conclusion. What are the essential lessons? Provide concrete, actionable steps for the reader. Look to the horizon and discuss the future implications of this knowledge. End with a compelling call to action that invites engagement or further learning.
 
-**INPUTS:**
-
-User's Expertise Profile: 
-
-{expertise_profile}
-
-    Topic: {selected_topic}
-    User's Story Bank: {story_bank}
     Target Audience: Junior to mid-level developers
 
-    Create a narrative blueprint that:
+    Using the inputs given at the end of this prompt, create a narrative blueprint that:
     1. Matches the trending topic to a personal experience or learning journey
     2. Designs an emotional arc that keeps readers engaged
     3. Identifies the "aha moment" that readers will remember
@@ -117,15 +110,28 @@ User's Expertise Profile:
     }}
 
     IMPORTANT: Return ONLY the JSON object, no markdown formatting or additional text.
+
+**INPUTS:**
+
+User's Expertise Profile: 
+
+{expertise_profile}
+
+    Topic: {selected_topic}
+    User's Story Bank: {story_bank}
     """
 
-def get_story_architect_agent() -> Agent:
+def get_story_architect_agent(verbose: Optional[bool] = None) -> Agent:
     """
     Initializes and returns the Narrative Designer Agent.
 
     This agent specializes in transforming technical concepts into engaging
     narratives that resonate with developers.
 
+    Args:
+        verbose: Whether CrewAI logs the agent's steps. Defaults to whether debug
+            logging is enabled when the agent is built.
+
     Returns:
         Agent: The configured Story Architect Agent.
     """
@@ -145,7 +151,7 @@ def get_story_architect_agent() -> Agent:
                 "technical concepts into engaging narratives that resonate with developers."
             ),
             llm=ai_client.get_llm(),
-            verbose=True,
+            verbose=logger.isEnabledFor(logging.DEBUG) if verbose is None else verbose,
             allow_delegation=False,
         )
         logger.debug("Story Architect Agent initialized successfully.")
@@ -4,6 +4,7 @@ This agent decodes and codifies unique writing voices from provided text.
 """
 
 import logging
+from typing import Optional
 
 from crewai import Agent
 
@@ -25,10 +26,7 @@ def get_style_decoder_prompt(linkedin_posts: str) -> str:
         str: The formatted prompt string.
     """
     return f"""
-    Analyze the following LinkedIn posts to decode the author's unique writing style:
-
-    LinkedIn Posts:
-    {linkedin_posts}
+    Analyze the LinkedIn posts given at the end of this prompt to decode the author's unique writing style.
 
     Extract and codify:
     1. Voice characteristics (formal/casual, humor style, personality traits)
@@ -70,15 +68,22 @@ def get_style_decoder_prompt(linkedin_posts: str) -> str:
     }}
 
     IMPORTANT: Return ONLY the JSON object, no markdown formatting or additional text.
+
+    LinkedIn Posts:
+    {linkedin_posts}
     """
 
-def get_style_decoder_agent() -> Agent:
+def get_style_decoder_agent(verbose: Optional[bool] = None) -> Agent:
     """
     Initializes and returns the Writing Style Analyst Agent.
 
     This agent analyzes writing patterns to create detailed style guides for
     authentic voice replication.
 
+    Args:
+        verbose: Whether CrewAI logs the agent's steps. Defaults to whether debug
+            logging is enabled when the agent is built.
+
     Returns:
         Agent: The configured Style Decoder Agent.
     """
@@ -99,7 +104,7 @@ def get_style_decoder_agent() -> Agent:
                 "and create detailed style guides for authentic voice replication."
             ),
             llm=style_decoder_llm,
-            verbose=True,
+            verbose=logger.isEnabledFor(logging.DEBUG) if verbose is None else verbose,
             allow_delegation=False,
         )
         logger.debug("Style Decoder Agent initialized successfully.")
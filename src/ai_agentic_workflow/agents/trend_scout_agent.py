@@ -5,6 +5,7 @@ This agent identifies trending topics relevant to user expertise and audience ne
 
 import json
 import logging
+from typing import Optional
 
 from crewai import Agent
 
@@ -37,7 +38,7 @@ def get_trend_scout_prompt(expertise_areas: str) -> str:
     6. Topics that junior to mid-level developers are struggling with
 
     Additional Context:
-    - User Expertise Areas: {expertise_areas}
+    - User Expertise Areas: given at the end of this prompt
     - Target Audience: Junior to mid-level developers, job seekers
 
     Find 15-20 trending topics that:
@@ -64,15 +65,21 @@ def get_trend_scout_prompt(expertise_areas: str) -> str:
     }}
 
     IMPORTANT: Return ONLY the JSON object, no markdown formatting or additional text.
+
+    User Expertise Areas: {expertise_areas}
     """
 
-def get_trend_scout_agent() -> Agent:
+def get_trend_scout_agent(verbose: Optional[bool] = None) -> Agent:
     """
     Initializes and returns the Tech Trend Researcher Agent.
 
     This agent monitors various platforms to discover trending and relevant
     technical topics for developers.
 
+    Args:
+        verbose: Whether CrewAI logs the agent's steps. Defaults to whether debug
+            logging is enabled when the agent is built.
+
     Returns:
         Agent: The configured Trend Scout Agent.
     """
@@ -93,7 +100,7 @@ def get_trend_scout_agent() -> Agent:
                 "to find the most engaging and relevant topics for developers."
             ),
             llm=trend_scout_llm,
-            verbose=True,
+            verbose=logger.isEnabledFor(logging.DEBUG) if verbose is None else verbose,
             allow_delegation=False,
         )
         logger.debug("Trend Scout Agent initialized successfully.")
@@ -1,4 +1,5 @@
 # src/ai_agentic_workflow/tools/__init__.py
-from notion_tools import NotionHelper
+from .notion_tools import NotionHelper, AsyncNotionHelper
+from .notion_cache import NotionCache
 
-__all__ = ["NotionHelper"]
+__all__ = ["NotionHelper", "AsyncNotionHelper", "NotionCache"]
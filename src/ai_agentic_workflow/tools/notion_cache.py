@@ -0,0 +1,63 @@
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class NotionCache:
+    """
+    Persistent on-disk cache of extracted Notion page text.
+
+    Rows are stored one per page in SQLite and keyed on
+    (page_id, last_edited_time), so an entry is only served while the page
+    is unchanged in Notion. Safe to share between the worker threads used by
+    NotionHelper.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = ".notion_cache.sqlite3"):
+        """
+        Opens (or creates) the cache database.
+
+        Args:
+            db_path: Path to the SQLite file. Use ":memory:" for a process-local cache.
+        """
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS page_text ("
+                "page_id TEXT PRIMARY KEY, "
+                "last_edited_time TEXT NOT NULL, "
+                "plain_text TEXT NOT NULL)"
+            )
+            self._conn.commit()
+        logger.info(f"Notion page cache ready at '{self.db_path}'.")
+
+    def get(self, page_id: str, last_edited_time: str) -> Optional[str]:
+        """Returns the cached text for the page revision, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT plain_text FROM page_text WHERE page_id = ? AND last_edited_time = ?",
+                (page_id, last_edited_time),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, page_id: str, last_edited_time: str, plain_text: str) -> None:
+        """Stores the text for the page revision, replacing any older revision."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page_text (page_id, last_edited_time, plain_text) VALUES (?, ?, ?)",
+                (page_id, last_edited_time, plain_text),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Closes the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
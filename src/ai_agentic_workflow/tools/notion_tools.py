@@ -1,13 +1,106 @@
+import asyncio
 import logging
-from typing import List, Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import AsyncIterator, Callable, List, Dict, Iterator, Optional, Tuple, Any
 
+import httpx
+from notion_client import AsyncClient as AsyncNotionClient
 from notion_client import Client as NotionClient
 from notion_client.errors import APIResponseError
 
+from src.ai_agentic_workflow.tools.notion_cache import NotionCache
 from src.ai_agentic_workflow.utils.env_reader import get_env_variable
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent block fetches issued by get_plain_text_for_pages
+DEFAULT_MAX_WORKERS = 16
+# Maximum page size accepted by the Notion API for paginated endpoints
+NOTION_PAGE_SIZE = 100
+# Connection pool shared by all requests of a helper, sized for concurrent fetches
+NOTION_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0)
+NOTION_TIMEOUT_MS = 30_000
+
+
+def _rich_text(block: Dict[str, Any], block_type: str) -> str:
+    rich_text = block.get(block_type, {}).get("rich_text", [])
+    return "".join(rt.get("plain_text", "") for rt in rich_text)
+
+
+def _text_block(block: Dict[str, Any], block_type: str) -> str:
+    # Trailing blank line after paragraphs/headings for structure
+    return _rich_text(block, block_type) + "\n\n"
+
+
+def _bulleted_list_item(block: Dict[str, Any], block_type: str) -> str:
+    return f"* {_rich_text(block, block_type)}"  # Prepend bullet point marker
+
+
+# Supported block types and how to render each; unsupported types are skipped.
+# Add entries here for other block types (numbered_list_item, to_do, code, etc.) if needed.
+_BLOCK_HANDLERS: Dict[str, Callable[[Dict[str, Any], str], str]] = {
+    "paragraph": _text_block,
+    "heading_1": _text_block,
+    "heading_2": _text_block,
+    "heading_3": _text_block,
+    "bulleted_list_item": _bulleted_list_item,
+}
+
+
+def _blocks_to_plain_text(blocks: List[Dict[str, Any]], page_id: str) -> str:
+    """
+    Concatenates plain text from supported block types (paragraphs, headings,
+    bulleted lists). Shared by the sync and async helpers.
+
+    Args:
+        blocks: Block objects as returned by the Notion blocks API.
+        page_id: The ID of the page the blocks belong to (used for logging).
+
+    Returns:
+        The concatenated text, or an empty string if no supported blocks were found.
+    """
+    texts: List[str] = []
+    for block in blocks:
+        block_type = block.get("type")
+        handler = _BLOCK_HANDLERS.get(block_type)
+        if handler is None:
+            continue
+
+        try:
+            texts.append(handler(block, block_type))
+        except Exception as block_e:
+            block_id = block.get("id", "unknown_id")  # For logging
+            logger.warning(
+                f"Could not parse block ID '{block_id}' of type '{block_type}' on page '{page_id}': {block_e}",
+                exc_info=False)
+            continue  # Skip faulty block
+
+    if not texts:
+        logger.info(f"No supported text content found on page '{page_id}'.")
+        return ""  # Return empty string instead of None if page exists but has no text
+
+    # Join paragraphs/elements, strip leading/trailing whitespace from the whole result
+    return "\n".join(texts).strip()
+
+
+def _notion_api_key_from_env() -> Optional[str]:
+    """Returns NOTION_API_KEY from the environment, or None if it is not set."""
+    try:
+        return get_env_variable("NOTION_API_KEY")
+    except KeyError:
+        return None
+
+
+def _page_title(page: Dict[str, Any]) -> str:
+    """Returns the page title from the standard 'Name' property, for logging."""
+    try:
+        title_prop = page.get("properties", {}).get("Name", {}).get("title", [])
+        if title_prop:
+            return title_prop[0].get("plain_text", "Unknown Title")
+    except Exception:
+        pass  # Ignore errors getting title
+    return "Unknown Title"
+
 
 class NotionHelper:
     """
@@ -18,25 +111,38 @@ class NotionHelper:
     and provides methods for common Notion tasks.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+            self,
+            api_key: Optional[str] = None,
+            cache: Optional[NotionCache] = None,
+            http_client: Optional[httpx.Client] = None
+    ):
         """
         Initializes the Notion Client.
 
         Args:
             api_key: Notion API Key (integration secret). If None, attempts
                      to read from the "NOTION_API_KEY" environment variable.
+            cache: Optional NotionCache. When provided, page text is served from
+                   the cache while the page's last_edited_time is unchanged.
+            http_client: Optional httpx.Client to send requests through, e.g. one
+                         with an HTTP caching transport. Defaults to a pooled
+                         client owned by this helper.
 
         Raises:
             ValueError: If no API key is provided or found in environment variables.
             # NotionClient itself might raise errors on invalid token, though often lazy
         """
-        token = api_key or get_env_variable("NOTION_API_KEY")
+        self.cache = cache
+        token = api_key or _notion_api_key_from_env()
         if not token:
             logger.error("Notion API Key not provided and not found in environment variable 'NOTION_API_KEY'.")
             raise ValueError("Missing Notion API Key.")
 
         try:
-            self.client = NotionClient(auth=token)
+            # One pooled HTTP client keeps connections alive across concurrent page fetches
+            self._http_client = http_client or httpx.Client(limits=NOTION_HTTP_LIMITS)
+            self.client = NotionClient(auth=token, client=self._http_client, timeout_ms=NOTION_TIMEOUT_MS)
             # Optionally add a check here, e.g., list users, to validate the key early
             # self.client.users.list() # Example check - uncomment if needed
             logger.info("Notion Client initialized successfully.")
@@ -45,53 +151,96 @@ class NotionHelper:
             # Depending on severity, re-raise or handle appropriately
             raise ConnectionError(f"Failed to initialize Notion Client: {e}") from e
 
-    def query_database(
+    def close(self) -> None:
+        """Closes the shared HTTP connection pool."""
+        self._http_client.close()
+
+    def iter_database(
             self,
             database_id: str,
             filter_params: Optional[Dict[str, Any]] = None,
             sorts: Optional[List[Dict[str, Any]]] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Queries a Notion database with optional filters and sorts.
+        Lazily yields pages from a Notion database query, following the
+        `next_cursor` pagination so databases with more than 100 matching
+        pages are returned in full.
 
         Args:
             database_id: The ID of the Notion database to query.
             filter_params: Notion API filter dictionary. See Notion API docs.
             sorts: Notion API sorts list. See Notion API docs.
 
-        Returns:
-            A list of Notion page objects (as dictionaries) matching the query,
-            or an empty list if no results or an error occurs.
+        Yields:
+            Notion page objects (as dictionaries). Iteration stops early, after
+            logging the error, if a request fails.
         """
         if not database_id:
             logger.error("Database ID is required for querying.")
-            return []
+            return
 
-        query: Dict[str, Any] = {"database_id": database_id}
+        query: Dict[str, Any] = {"database_id": database_id, "page_size": NOTION_PAGE_SIZE}
         if filter_params:
             query["filter"] = filter_params
         if sorts:
             query["sorts"] = sorts
 
         logger.debug(f"Querying Notion database '{database_id}' with params: {query}")
+        total = 0
         try:
-            response = self.client.databases.query(**query)
-            results = response.get("results", [])
-            logger.info(f"Found {len(results)} pages in database '{database_id}' matching query.")
-            return results
+            while True:
+                response = self.client.databases.query(**query)
+                results = response.get("results", [])
+                total += len(results)
+                yield from results
+                if not response.get("has_more") or not response.get("next_cursor"):
+                    break
+                query["start_cursor"] = response["next_cursor"]
         except APIResponseError as e:
             logger.error(f"Notion API error querying database '{database_id}': {e}", exc_info=True)
-            return []
         except Exception as e:
             logger.error(f"Unexpected error querying database '{database_id}': {e}", exc_info=True)
-            return []
+        logger.info(f"Found {total} pages in database '{database_id}' matching query.")
+
+    def query_database(
+            self,
+            database_id: str,
+            filter_params: Optional[Dict[str, Any]] = None,
+            sorts: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Queries a Notion database with optional filters and sorts.
+
+        Args:
+            database_id: The ID of the Notion database to query.
+            filter_params: Notion API filter dictionary. See Notion API docs.
+            sorts: Notion API sorts list. See Notion API docs.
+
+        Returns:
+            A list of Notion page objects (as dictionaries) matching the query,
+            or an empty list if no results or an error occurs.
+        """
+        return list(self.iter_database(database_id, filter_params=filter_params, sorts=sorts))
 
-    def get_plain_text_for_pages(self, page_ids: List[str]) -> Dict[str, Optional[str]]:
+    def get_plain_text_for_pages(
+            self,
+            page_ids: List[str],
+            max_workers: Optional[int] = None,
+            last_edited_times: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Optional[str]]:
         """
         Retrieves plain text content for multiple page IDs.
 
+        Pages are fetched concurrently on a bounded thread pool sharing the
+        single Notion client, since each fetch is dominated by network latency.
+
         Args:
             page_ids: A list of Notion page IDs.
+            max_workers: Maximum number of concurrent fetches. Defaults to
+                         min(DEFAULT_MAX_WORKERS, len(page_ids)).
+            last_edited_times: Optional mapping of page ID to its last_edited_time
+                               (e.g. taken from query_database results), used as
+                               the cache key without an extra pages.retrieve call.
 
         Returns:
             A dictionary where keys are the input page IDs and values are the
@@ -104,22 +253,36 @@ class NotionHelper:
             logger.warning("get_plain_text_for_pages called with an empty list of page IDs.")
             return results
 
-        for page_id in page_ids:
-            logger.debug(f"Processing request for page content: {page_id}")
-            # Call the single-page function which uses the internal helpers
-            content = self.get_page_plain_text(page_id)
-            results[page_id] = content  # Store content (str) or None
+        last_edited_times = last_edited_times or {}
+        workers = max_workers or min(DEFAULT_MAX_WORKERS, len(page_ids))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(self.get_page_plain_text, page_id,
+                            last_edited_time=last_edited_times.get(page_id)): page_id
+                for page_id in page_ids
+            }
+            for future in as_completed(futures):
+                page_id = futures[future]
+                try:
+                    results[page_id] = future.result()  # Store content (str) or None
+                except Exception as e:
+                    logger.error(f"Unexpected error fetching content for page '{page_id}': {e}", exc_info=True)
+                    results[page_id] = None
 
         logger.info(f"Processed content requests for {len(page_ids)} page IDs.")
-        return results
+        # Preserve the caller's ordering of page IDs
+        return {page_id: results.get(page_id) for page_id in page_ids}
 
-    def get_page_plain_text(self, page_id: str) -> Optional[str]:
+    def get_page_plain_text(self, page_id: str, *, last_edited_time: Optional[str] = None) -> Optional[str]:
         """
         Retrieves and concatenates plain text from supported block types
         (paragraphs, headings, bulleted lists) within a Notion page.
 
         Args:
             page_id: The ID of the Notion page.
+            last_edited_time: The page's last_edited_time, if already known. Only
+                              used when a cache is configured; if omitted, it is
+                              looked up with pages.retrieve.
 
         Returns:
             A string containing the concatenated text, or None if an error occurs
@@ -129,11 +292,25 @@ class NotionHelper:
             logger.error("Page ID is required for fetching content.")
             return None
 
+        if self.cache is not None:
+            if last_edited_time is None:
+                last_edited_time = self._get_last_edited_time(page_id)
+            if last_edited_time is not None:
+                cached = self.cache.get(page_id, last_edited_time)
+                if cached is not None:
+                    logger.debug(f"Cache hit for page '{page_id}' ({last_edited_time})")
+                    return cached
+
         logger.debug(f"Fetching blocks for page '{page_id}'")
         try:
-            # TODO: Implement pagination for pages with > 100 blocks if needed
-            response = self.client.blocks.children.list(block_id=page_id)
-            blocks = response.get("results", [])
+            blocks: List[Dict[str, Any]] = []
+            kwargs: Dict[str, Any] = {"block_id": page_id, "page_size": NOTION_PAGE_SIZE}
+            while True:
+                response = self.client.blocks.children.list(**kwargs)
+                blocks.extend(response.get("results", []))
+                if not response.get("has_more") or not response.get("next_cursor"):
+                    break
+                kwargs["start_cursor"] = response["next_cursor"]
         except APIResponseError as e:
             logger.error(f"Notion API error fetching blocks for page '{page_id}': {e}", exc_info=True)
             return None
@@ -141,44 +318,64 @@ class NotionHelper:
             logger.error(f"Unexpected error fetching blocks for page '{page_id}': {e}", exc_info=True)
             return None
 
-        texts: List[str] = []
-        for block in blocks:
-            block_type = block.get("type")
-            block_id = block.get("id", "unknown_id")  # For logging
+        text = _blocks_to_plain_text(blocks, page_id)
+        if self.cache is not None and last_edited_time is not None:
+            self.cache.set(page_id, last_edited_time, text)
+        return text
 
-            try:
-                if block_type in ["paragraph", "heading_1", "heading_2", "heading_3"]:
-                    # Extract text from simple rich text blocks
-                    rich_text = block.get(block_type, {}).get("rich_text", [])
-                    for rt in rich_text:
-                        texts.append(rt.get("plain_text", ""))
-                    texts.append("\n")  # Add newline after these blocks for structure
-
-                elif block_type == "bulleted_list_item":
-                    rich_text = block.get(block_type, {}).get("rich_text", [])
-                    item_text = "".join([rt.get("plain_text", "") for rt in rich_text])
-                    texts.append(f"* {item_text}")  # Prepend bullet point marker
-
-                # Add elif for other block types (numbered_list_item, todo, code, etc.) if needed
-                # Example:
-                # elif block_type == "numbered_list_item":
-                #     rich_text = block.get(block_type, {}).get("rich_text", [])
-                #     item_text = "".join([rt.get("plain_text", "") for rt in rich_text])
-                #     # Note: Getting the correct number requires tracking state or more complex logic
-                #     texts.append(f"1. {item_text}") # Placeholder number
-
-            except Exception as block_e:
-                logger.warning(
-                    f"Could not parse block ID '{block_id}' of type '{block_type}' on page '{page_id}': {block_e}",
-                    exc_info=False)
-                continue  # Skip faulty block
-
-        if not texts:
-            logger.info(f"No supported text content found on page '{page_id}'.")
-            return ""  # Return empty string instead of None if page exists but has no text
-
-        # Join paragraphs/elements, strip leading/trailing whitespace from the whole result
-        return "\n".join(texts).strip()
+    def _get_last_edited_time(self, page_id: str) -> Optional[str]:
+        """Returns the page's last_edited_time, or None if it cannot be retrieved."""
+        try:
+            return self.client.pages.retrieve(page_id=page_id).get("last_edited_time")
+        except Exception as e:
+            logger.warning(f"Could not retrieve last_edited_time for page '{page_id}': {e}")
+            return None
+
+    def iter_excerpts_by_filter(
+            self,
+            database_id: str,
+            filter_params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Streams the plain text of pages matching a Notion filter, in query order.
+
+        Pages are consumed one cursor page at a time from iter_database and each
+        batch is fetched concurrently, so memory stays bounded by the batch size
+        and callers can start processing before the whole database is read.
+
+        Args:
+            database_id: The ID of the Notion database.
+            filter_params: A Notion API filter dictionary. If None, queries all pages.
+
+        Yields:
+            (page_id, text) tuples for pages with non-empty extractable text.
+        """
+        batch: List[Dict[str, Any]] = []
+        for page in self.iter_database(database_id, filter_params=filter_params):
+            batch.append(page)
+            if len(batch) >= NOTION_PAGE_SIZE:
+                yield from self._fetch_excerpt_batch(batch)
+                batch = []
+        if batch:
+            yield from self._fetch_excerpt_batch(batch)
+
+    def _fetch_excerpt_batch(self, pages: List[Dict[str, Any]]) -> Iterator[Tuple[str, str]]:
+        """Fetches text for a batch of query results, yielding non-empty excerpts in order."""
+        page_ids = [page.get("id") for page in pages if page.get("id")]
+        if len(page_ids) < len(pages):
+            logger.warning(f"{len(pages) - len(page_ids)} page object(s) from filter had no valid page ID.")
+        if not page_ids:
+            return
+
+        last_edited_times = {page["id"]: page["last_edited_time"] for page in pages
+                             if page.get("id") and page.get("last_edited_time")}
+        content_map = self.get_plain_text_for_pages(page_ids, last_edited_times=last_edited_times)
+        for page_id in page_ids:  # Iterate in order of original query
+            content = content_map.get(page_id)
+            if content:  # Checks for non-empty string
+                yield page_id, content
+            elif content is None:
+                logger.warning(f"Failed to fetch content for page {page_id} (matched by filter)")
 
     def get_excerpts_by_filter(
             self,
@@ -187,7 +384,8 @@ class NotionHelper:
     ) -> Optional[str]:
         """
         Fetches pages based on a provided Notion filter dictionary and
-        concatenates their plain text content.
+        concatenates their plain text content. Prefer iter_excerpts_by_filter
+        for large databases.
 
         Args:
             database_id: The ID of the Notion database.
@@ -197,45 +395,17 @@ class NotionHelper:
         Returns:
             A single string with concatenated text from matching pages, separated
             by '---'. Returns an empty string "" if no pages match or matching pages
-            have no text. Returns None if the initial database query fails (though
-            query_database aims to return [] on error).
+            have no text.
         """
         log_filter = filter_params if filter_params else "No filter (all pages)"
         logger.info(f"Fetching excerpts for filter '{log_filter}' in database '{database_id}'")
 
-        # 1. Query database using the provided filter
-        pages = self.query_database(database_id, filter_params=filter_params)
-
-        # Handle case where query fails or returns no results
-        if not pages:
-            logger.info(f"No pages found matching the filter in database '{database_id}'.")
-            return ""
-
-        # 2. Extract page IDs
-        page_ids_to_fetch = [page.get("id") for page in pages if page.get("id")]
-        if not page_ids_to_fetch:
-            logger.warning(f"Found {len(pages)} page objects from filter, but couldn't extract valid page IDs.")
-            return ""
-
-        # 3. Fetch content for these specific IDs
-        content_map = self.get_plain_text_for_pages(page_ids_to_fetch)
-
-        # 4. Collect and combine non-empty, non-None results
-        excerpts: List[str] = []
-        successful_fetches = 0
-        for page_id in page_ids_to_fetch:  # Iterate in order of original query
-            content = content_map.get(page_id)
-            if content:  # Checks for non-empty string
-                excerpts.append(content)
-                successful_fetches += 1
-            elif content is None:
-                logger.warning(f"Failed to fetch content for page {page_id} (matched by filter)")
-
+        excerpts = [text for _, text in self.iter_excerpts_by_filter(database_id, filter_params=filter_params)]
         if not excerpts:
-            logger.info(f"Found {len(pages)} pages matching filter, but none had extractable text or fetch failed.")
+            logger.info(f"No pages matching the filter in database '{database_id}' had extractable text.")
             return ""
 
-        logger.info(f"Successfully extracted text from {successful_fetches} out of {len(pages)} pages matching filter.")
+        logger.info(f"Successfully extracted text from {len(excerpts)} pages matching filter.")
         return "\n\n---\n\n".join(excerpts)  # Use distinct separator
 
     def get_excerpts_by_multi_select_tag(
@@ -272,27 +442,20 @@ class NotionHelper:
             logger.info(f"No pages found with tag '{tag_name}' in database '{database_id}'.")
             return ""  # No pages match
 
-        excerpts: List[str] = []
-        for i, page in enumerate(pages):
-            page_id = page.get("id")
-            page_title = "Unknown Title"
-            # Try to get page title for better logging (assuming standard 'Name' property)
-            try:
-                title_prop = page.get("properties", {}).get("Name", {}).get("title", [])
-                if title_prop:
-                    page_title = title_prop[0].get("plain_text", "Unknown Title")
-            except Exception:
-                pass  # Ignore errors getting title
-
-            if page_id:
-                logger.debug(f"Processing page {i + 1}/{len(pages)}: ID '{page_id}', Title '{page_title}'")
-                excerpt = self.get_page_plain_text(page_id)
-                if excerpt:  # Only add if text was actually extracted
-                    excerpts.append(excerpt)
-                else:
-                    logger.debug(f"Page '{page_id}' ('{page_title}') had no extractable text.")
-            else:
-                logger.warning(f"Page data missing ID in query results: {page}")
+        page_ids = [page.get("id") for page in pages if page.get("id")]
+        if len(page_ids) < len(pages):
+            logger.warning(f"{len(pages) - len(page_ids)} page(s) missing ID in query results for tag '{tag_name}'.")
+        last_edited_times = {page["id"]: page["last_edited_time"] for page in pages
+                             if page.get("id") and page.get("last_edited_time")}
+
+        content_map = self.get_plain_text_for_pages(page_ids, last_edited_times=last_edited_times)
+        excerpts = [content_map[page_id] for page_id in page_ids if content_map.get(page_id)]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            for page in pages:
+                page_id = page.get("id")
+                if page_id and not content_map.get(page_id):
+                    logger.debug(f"Page '{page_id}' ('{_page_title(page)}') had no extractable text.")
 
         if not excerpts:
             logger.info(f"Found {len(pages)} pages with tag '{tag_name}', but none had extractable text.")
@@ -303,6 +466,266 @@ class NotionHelper:
         return "\n\n---\n\n".join(excerpts)  # Use more distinct separator
 
 
+class AsyncNotionHelper:
+    """
+    Async counterpart of NotionHelper for fanning out many Notion requests
+    from a single event loop.
+
+    Uses notion_client's AsyncClient on top of one shared httpx.AsyncClient so
+    concurrent requests reuse pooled connections. Call `aclose()` (or use the
+    helper as an async context manager) when done.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[NotionCache] = None):
+        """
+        Initializes the async Notion Client.
+
+        Args:
+            api_key: Notion API Key (integration secret). If None, attempts
+                     to read from the "NOTION_API_KEY" environment variable.
+            cache: Optional NotionCache, consulted when a page's last_edited_time
+                   is known from query results.
+
+        Raises:
+            ValueError: If no API key is provided or found in environment variables.
+        """
+        token = api_key or _notion_api_key_from_env()
+        if not token:
+            logger.error("Notion API Key not provided and not found in environment variable 'NOTION_API_KEY'.")
+            raise ValueError("Missing Notion API Key.")
+
+        self.cache = cache
+        try:
+            self._http_client = httpx.AsyncClient(limits=NOTION_HTTP_LIMITS)
+            self.client = AsyncNotionClient(auth=token, client=self._http_client, timeout_ms=NOTION_TIMEOUT_MS)
+            logger.info("Async Notion Client initialized successfully.")
+        except Exception as e:
+            logger.error(f"Failed to initialize async Notion Client: {e}", exc_info=True)
+            raise ConnectionError(f"Failed to initialize async Notion Client: {e}") from e
+
+    async def __aenter__(self) -> "AsyncNotionHelper":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Closes the shared HTTP connection pool."""
+        await self._http_client.aclose()
+
+    async def iter_database(
+            self,
+            database_id: str,
+            filter_params: Optional[Dict[str, Any]] = None,
+            sorts: Optional[List[Dict[str, Any]]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Lazily yields pages from a Notion database query, following the
+        `next_cursor` pagination. Iteration stops early, after logging the
+        error, if a request fails.
+        """
+        if not database_id:
+            logger.error("Database ID is required for querying.")
+            return
+
+        query: Dict[str, Any] = {"database_id": database_id, "page_size": NOTION_PAGE_SIZE}
+        if filter_params:
+            query["filter"] = filter_params
+        if sorts:
+            query["sorts"] = sorts
+
+        logger.debug(f"Querying Notion database '{database_id}' with params: {query}")
+        total = 0
+        try:
+            while True:
+                response = await self.client.databases.query(**query)
+                results = response.get("results", [])
+                total += len(results)
+                for page in results:
+                    yield page
+                if not response.get("has_more") or not response.get("next_cursor"):
+                    break
+                query["start_cursor"] = response["next_cursor"]
+        except APIResponseError as e:
+            logger.error(f"Notion API error querying database '{database_id}': {e}", exc_info=True)
+        except Exception as e:
+            logger.error(f"Unexpected error querying database '{database_id}': {e}", exc_info=True)
+        logger.info(f"Found {total} pages in database '{database_id}' matching query.")
+
+    async def query_database(
+            self,
+            database_id: str,
+            filter_params: Optional[Dict[str, Any]] = None,
+            sorts: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Queries a Notion database with optional filters and sorts.
+
+        Returns:
+            A list of Notion page objects matching the query, or an empty list
+            if no results or an error occurs.
+        """
+        return [page async for page in self.iter_database(database_id, filter_params=filter_params, sorts=sorts)]
+
+    async def get_page_plain_text(self, page_id: str, *, last_edited_time: Optional[str] = None) -> Optional[str]:
+        """
+        Retrieves and concatenates plain text from supported block types
+        within a Notion page.
+
+        Args:
+            page_id: The ID of the Notion page.
+            last_edited_time: The page's last_edited_time from query results;
+                              enables the cache lookup when a cache is configured.
+
+        Returns:
+            A string containing the concatenated text, or None if an error occurs.
+        """
+        if not page_id:
+            logger.error("Page ID is required for fetching content.")
+            return None
+
+        if self.cache is not None and last_edited_time is not None:
+            cached = self.cache.get(page_id, last_edited_time)
+            if cached is not None:
+                logger.debug(f"Cache hit for page '{page_id}' ({last_edited_time})")
+                return cached
+
+        logger.debug(f"Fetching blocks for page '{page_id}'")
+        try:
+            blocks: List[Dict[str, Any]] = []
+            kwargs: Dict[str, Any] = {"block_id": page_id, "page_size": NOTION_PAGE_SIZE}
+            while True:
+                response = await self.client.blocks.children.list(**kwargs)
+                blocks.extend(response.get("results", []))
+                if not response.get("has_more") or not response.get("next_cursor"):
+                    break
+                kwargs["start_cursor"] = response["next_cursor"]
+        except APIResponseError as e:
+            logger.error(f"Notion API error fetching blocks for page '{page_id}': {e}", exc_info=True)
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error fetching blocks for page '{page_id}': {e}", exc_info=True)
+            return None
+
+        text = _blocks_to_plain_text(blocks, page_id)
+        if self.cache is not None and last_edited_time is not None:
+            self.cache.set(page_id, last_edited_time, text)
+        return text
+
+    async def get_plain_text_for_pages(
+            self,
+            page_ids: List[str],
+            last_edited_times: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Retrieves plain text content for multiple page IDs concurrently.
+
+        Args:
+            page_ids: A list of Notion page IDs.
+            last_edited_times: Optional mapping of page ID to last_edited_time, used
+                               as the cache key.
+
+        Returns:
+            A dictionary mapping each input page ID to its extracted text,
+            or None if fetching that page failed.
+        """
+        if not page_ids:
+            logger.warning("get_plain_text_for_pages called with an empty list of page IDs.")
+            return {}
+
+        last_edited_times = last_edited_times or {}
+        contents = await asyncio.gather(
+            *(self.get_page_plain_text(page_id, last_edited_time=last_edited_times.get(page_id))
+              for page_id in page_ids),
+            return_exceptions=True
+        )
+        results: Dict[str, Optional[str]] = {}
+        for page_id, content in zip(page_ids, contents):
+            if isinstance(content, BaseException):
+                logger.error(f"Unexpected error fetching content for page '{page_id}': {content}")
+                content = None
+            results[page_id] = content
+
+        logger.info(f"Processed content requests for {len(page_ids)} page IDs.")
+        return results
+
+    async def get_excerpts_by_filter(
+            self,
+            database_id: str,
+            filter_params: Optional[Dict[str, Any]] = None,
+            concurrency: int = DEFAULT_MAX_WORKERS
+    ) -> Optional[str]:
+        """
+        Fetches pages matching a Notion filter and concatenates their plain
+        text content, separated by '---'.
+
+        Walking the query cursor and fetching page blocks are pipelined through
+        a bounded queue: one producer feeds pages to `concurrency` consumers as
+        soon as each cursor page arrives, so cursor latency overlaps block fetches.
+
+        Returns:
+            The concatenated text in query order, or an empty string if no pages
+            match or matching pages have no text.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * NOTION_PAGE_SIZE)
+        contents: Dict[int, Optional[str]] = {}
+        page_count = 0
+
+        async def produce() -> None:
+            nonlocal page_count
+            try:
+                async for page in self.iter_database(database_id, filter_params=filter_params):
+                    page_id = page.get("id")
+                    if not page_id:
+                        logger.warning(f"Page data missing ID in query results: {page}")
+                        continue
+                    await queue.put((page_count, page_id, page.get("last_edited_time")))
+                    page_count += 1
+            finally:
+                for _ in range(concurrency):
+                    await queue.put(None)  # One stop signal per consumer
+
+        async def consume() -> None:
+            while (item := await queue.get()) is not None:
+                index, page_id, last_edited_time = item
+                try:
+                    contents[index] = await self.get_page_plain_text(page_id, last_edited_time=last_edited_time)
+                except Exception as e:
+                    logger.error(f"Unexpected error fetching content for page '{page_id}': {e}")
+
+        await asyncio.gather(produce(), *(consume() for _ in range(concurrency)))
+
+        excerpts = [contents[index] for index in range(page_count) if contents.get(index)]
+        if not excerpts:
+            logger.info(f"No pages matching the filter in database '{database_id}' had extractable text.")
+            return ""
+
+        logger.info(f"Successfully extracted text from {len(excerpts)} out of {page_count} pages matching filter.")
+        return "\n\n---\n\n".join(excerpts)
+
+    async def get_excerpts_by_multi_select_tag(
+            self,
+            database_id: str,
+            tag_name: str,
+            tag_property_name: str = "Tags"
+    ) -> Optional[str]:
+        """
+        Fetches all pages in a database containing a specific tag (multi-select)
+        and concatenates their plain text content, separated by '---'.
+
+        Returns:
+            The concatenated text, or an empty string if no pages match or
+            matching pages have no text.
+        """
+        logger.info(
+            f"Fetching excerpts for tag '{tag_name}' in database '{database_id}' (property: '{tag_property_name}')")
+        filter_params = {
+            "property": tag_property_name,
+            "multi_select": {"contains": tag_name}
+        }
+        return await self.get_excerpts_by_filter(database_id, filter_params=filter_params)
+
+
 # --- Basic Testing/Example Usage ---
 if __name__ == '__main__':
     # Configure logging for detailed output when running directly
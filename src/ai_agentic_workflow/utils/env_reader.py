@@ -1,14 +1,24 @@
 import os
+from functools import lru_cache
+
 from dotenv import load_dotenv
 
 # Load environment variables from .env at project root
 load_dotenv()
 
+@lru_cache(maxsize=None)
 def get_env_variable(name: str) -> str:
     """
     Fetches the environment variable or raises an error if not found.
+
+    Found values are cached for the life of the process; call
+    ``get_env_variable.cache_clear()`` after changing the environment or
+    reloading ``.env``. Missing variables are not cached.
+
+    Raises:
+        KeyError: If the variable is not set.
     """
-    value = os.getenv(name)
+    value = os.environ.get(name)
     if value is None:
         raise KeyError(f"Environment variable '{name}' is not set.")
-    return value
\ No newline at end of file
+    return value
@@ -1,26 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
 import os
 import json
 import logging
 import re
-from typing import List, Dict, Any
+import tempfile
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Dict, Any, Set
 
+import httpx
 import requests
-import openai
-import google.generativeai as genai
 
 from .env_reader import get_env_variable
 
+try:  # Optional C-accelerated JSON encoder
+    import orjson
+except ImportError:  # pragma: no cover - falls back to stdlib json
+    orjson = None
+
+if TYPE_CHECKING:  # SDKs are imported lazily at call time to keep module import cheap
+    import openai
+
 logger = logging.getLogger(__name__)
 
+# OpenAI clients (and their connection pools) reused across calls, keyed by API key
+_openai_clients: Dict[str, openai.OpenAI] = {}
+
+AUDIO_MODEL = "gemini-2.5-pro-preview-tts"
+
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
+
 
 def _slugify(text: str) -> str:
-    slug = re.sub(r"[^a-zA-Z0-9]+", "_", text.strip().lower())
-    return slug.strip("_")
+    return _SLUG_RE.sub("_", text.strip().lower()).strip("_")
 
 
 def generate_image(prompt: str, api_key: str, model: str = "dall-e-3") -> bytes:
     """Generate an image using OpenAI's image API and return raw bytes."""
-    client = openai.OpenAI(api_key=api_key)
+    client = _openai_clients.get(api_key)
+    if client is None:
+        import openai
+        client = _openai_clients.setdefault(api_key, openai.OpenAI(api_key=api_key))
     response = client.images.generate(prompt=prompt, n=1, model=model)
     url = response.data[0].url
     resp = requests.get(url, timeout=30)
@@ -28,8 +49,10 @@ def generate_image(prompt: str, api_key: str, model: str = "dall-e-3") -> bytes:
     return resp.content
 
 
-def generate_audio(text: str, api_key: str, model: str = "gemini-2.5-pro-preview-tts") -> bytes:
+def generate_audio(text: str, api_key: str, model: str = AUDIO_MODEL) -> bytes:
     """Generate speech audio using Gemini TTS and return raw bytes."""
+    import google.generativeai as genai
+
     genai.configure(api_key=api_key)
     model_obj = genai.GenerativeModel(model)
     response = model_obj.generate_content(text)
@@ -41,37 +64,157 @@ def generate_audio(text: str, api_key: str, model: str = "gemini-2.5-pro-preview
     return audio_bytes
 
 
-def create_media_files(visual_prompts: List[Dict[str, Any]],
-                       script_scenes: List[Dict[str, Any]],
-                       output_dir: str = "media") -> None:
-    """Generate image and audio files for each scene."""
+async def generate_image_async(prompt: str, client: openai.AsyncOpenAI, http: httpx.AsyncClient,
+                               model: str = "dall-e-3") -> bytes:
+    """Async variant of :func:`generate_image` using shared OpenAI and HTTP clients."""
+    response = await client.images.generate(prompt=prompt, n=1, model=model)
+    url = response.data[0].url
+    resp = await http.get(url, timeout=30)
+    resp.raise_for_status()
+    return resp.content
+
+
+async def generate_audio_async(text: str, model: str = AUDIO_MODEL) -> bytes:
+    """Async variant of :func:`generate_audio`. Expects ``genai.configure`` to have been called."""
+    import google.generativeai as genai
+
+    model_obj = genai.GenerativeModel(model)
+    response = await model_obj.generate_content_async(text)
+    try:
+        audio_bytes = response.candidates[0].audio
+    except Exception as exc:  # pragma: no cover - depends on API
+        logger.error("Unexpected audio response: %s", exc)
+        raise
+    return audio_bytes
+
+
+def _write_file(path: str, data: bytes) -> None:
+    """
+    Write ``data`` to ``path`` atomically, so readers never see a partial file.
+
+    Each write goes through its own temporary file in the same directory, so concurrent
+    writers to one path never share it; it is removed if the write fails.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates the file owner-only
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _dumps(obj: Any) -> bytes:
+    """Compact JSON encoding, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _content_key(data: bytes) -> str:
+    """Stable digest identifying identical generation requests."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _shared_job(jobs: Dict[str, asyncio.Task], key: str,
+                factory: Callable[[], Awaitable[bytes]]) -> asyncio.Task:
+    """Return the in-flight generation for ``key``, starting it on first request."""
+    job = jobs.get(key)
+    if job is None:
+        job = jobs[key] = asyncio.ensure_future(factory())
+    return job
+
+
+def _claim_path(claimed: Set[str], path: str) -> str:
+    """Return ``path``, or a numbered variant of it when another scene already claimed it."""
+    root, ext = os.path.splitext(path)
+    candidate, n = path, 1
+    while candidate in claimed:
+        n += 1
+        candidate = f"{root}_{n}{ext}"
+    claimed.add(candidate)
+    return candidate
+
+
+async def _save_image(prompt: Dict[str, Any], output_dir: str,
+                      client: openai.AsyncOpenAI, http: httpx.AsyncClient,
+                      jobs: Dict[str, asyncio.Task], claimed: Set[str]) -> None:
+    scene_num = int(prompt.get("scene_number", 0))
+    desc = prompt.get("main_subject", "scene")
+    slug = _slugify(desc)[:40]
+    text_prompt = _dumps(prompt).decode("utf-8")
+    # The scene number only names the file; scenes that differ in nothing else share a generation
+    job_key = _content_key(_dumps({key: value for key, value in prompt.items() if key != "scene_number"}))
+    # Claimed before the first await, so paths are assigned in prompt order
+    img_path = _claim_path(claimed, os.path.join(output_dir, f"{scene_num:02d}_{slug}.png"))
+    try:
+        img_bytes = await _shared_job(jobs, job_key,
+                                      lambda: generate_image_async(text_prompt, client, http))
+        await asyncio.to_thread(_write_file, img_path, img_bytes)
+        logger.info("Saved image %s", img_path)
+    except Exception as exc:  # pragma: no cover - network failures not tested
+        logger.error("Failed generating image for scene %s: %s", scene_num, exc)
+
+
+async def _save_audio(scene: Dict[str, Any], output_dir: str,
+                      jobs: Dict[str, asyncio.Task], claimed: Set[str], model: str = AUDIO_MODEL) -> None:
+    scene_num = int(scene.get("scene_number", 0))
+    narration = scene.get("narration", "")
+    slug = _slugify(scene.get("title", "scene"))[:40]
+    audio_path = _claim_path(claimed, os.path.join(output_dir, f"{scene_num:02d}_{slug}.mp3"))
+    try:
+        audio_bytes = await _shared_job(jobs, _content_key(f"{model}\x00{narration}".encode("utf-8")),
+                                        lambda: generate_audio_async(narration, model=model))
+        await asyncio.to_thread(_write_file, audio_path, audio_bytes)
+        logger.info("Saved audio %s", audio_path)
+    except Exception as exc:  # pragma: no cover
+        logger.error("Failed generating audio for scene %s: %s", scene_num, exc)
+
+
+async def create_media_files_async(visual_prompts: List[Dict[str, Any]],
+                                   script_scenes: List[Dict[str, Any]],
+                                   output_dir: str = "media") -> None:
+    """Generate image and audio files for all scenes concurrently.
+
+    Scenes with identical image prompts (apart from the scene number) or narration share a
+    single generation call; every scene is still written to its own file.
+    """
     openai_key = get_env_variable("OPENAI_API_KEY")
     gemini_key = get_env_variable("GEMINI_API_KEY")
     os.makedirs(output_dir, exist_ok=True)
 
-    for prompt in visual_prompts:
-        scene_num = int(prompt.get("scene_number", 0))
-        desc = prompt.get("main_subject", "scene")
-        slug = _slugify(desc)[:40]
-        text_prompt = json.dumps(prompt)
-        try:
-            img_bytes = generate_image(text_prompt, api_key=openai_key)
-            img_path = os.path.join(output_dir, f"{scene_num:02d}_{slug}.png")
-            with open(img_path, "wb") as f:
-                f.write(img_bytes)
-            logger.info("Saved image %s", img_path)
-        except Exception as exc:  # pragma: no cover - network failures not tested
-            logger.error("Failed generating image for scene %s: %s", scene_num, exc)
-
-    for scene in script_scenes:
-        scene_num = int(scene.get("scene_number", 0))
-        narration = scene.get("narration", "")
-        slug = _slugify(scene.get("title", "scene"))[:40]
-        try:
-            audio_bytes = generate_audio(narration, api_key=gemini_key)
-            audio_path = os.path.join(output_dir, f"{scene_num:02d}_{slug}.mp3")
-            with open(audio_path, "wb") as f:
-                f.write(audio_bytes)
-            logger.info("Saved audio %s", audio_path)
-        except Exception as exc:  # pragma: no cover
-            logger.error("Failed generating audio for scene %s: %s", scene_num, exc)
+    import google.generativeai as genai
+    genai.configure(api_key=gemini_key)
+
+    # Async clients are bound to the running event loop, so one is created per invocation
+    import openai
+    client = openai.AsyncOpenAI(api_key=openai_key)
+    image_jobs: Dict[str, asyncio.Task] = {}
+    audio_jobs: Dict[str, asyncio.Task] = {}
+    claimed_paths: Set[str] = set()
+    async with httpx.AsyncClient() as http:
+        await asyncio.gather(
+            *(_save_image(prompt, output_dir, client, http, image_jobs, claimed_paths) for prompt in visual_prompts),
+            *(_save_audio(scene, output_dir, audio_jobs, claimed_paths) for scene in script_scenes),
+        )
+
+
+def create_media_files(visual_prompts: List[Dict[str, Any]],
+                       script_scenes: List[Dict[str, Any]],
+                       output_dir: str = "media") -> None:
+    """Generate image and audio files for each scene.
+
+    Blocking wrapper around :func:`create_media_files_async`; call the async
+    version directly when already inside an event loop.
+    """
+    asyncio.run(create_media_files_async(visual_prompts, script_scenes, output_dir))
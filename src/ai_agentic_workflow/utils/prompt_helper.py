@@ -1,4 +1,6 @@
 import logging
+import mmap
+from functools import lru_cache
 from pathlib import Path
 
 # Setup basic logging
@@ -21,32 +23,50 @@ def _init_() -> Path:
     return prompts_dir
 
 
+# The prompts directory is fixed for the lifetime of the process
+_PROMPTS_DIR = _init_()
+
+
+# Prompt files at or above this size are memory-mapped instead of read through a buffer
+_MMAP_THRESHOLD_BYTES = 64 * 1024
+
+
+@lru_cache(maxsize=128)
+def _read_prompt_file(path_str: str, mtime: float) -> str:
+    """Read a prompt file once per modification time; repeat calls are served from memory."""
+    path = Path(path_str)
+    if path.stat().st_size < _MMAP_THRESHOLD_BYTES:
+        return path.read_text(encoding="utf-8")
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm[:].decode("utf-8")
+
+
 def get_prompt_content(prompt_name: str = None, file_name: str = None) -> str | None:
     try:
-        prompt_dir = _init_()
+        prompt_dir = _PROMPTS_DIR
         # Construct the full file name (e.g., "breakdown_prompt.txt")
         if file_name is None:
             file_name = f"{prompt_name}_prompt.txt"
         # Create the full path to the file
         prompt_path = prompt_dir / file_name
 
-        logger.info(f"Attempting to load prompt from: {prompt_path}")
+        logger.debug(f"Attempting to load prompt from: {prompt_path}")
 
-        # Check if the file exists before trying to open it
-        if not prompt_path.is_file():
+        # A single stat both checks the file exists and supplies the cache key
+        try:
+            mtime = prompt_path.stat().st_mtime
+        except FileNotFoundError:
             logger.warning(f"Prompt file not found at: {prompt_path}")
             return None
 
-        # Read the file content
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        # Read the file content (cached per path until the file is modified)
+        content = _read_prompt_file(str(prompt_path), mtime)
 
-        logger.info(f"Successfully loaded prompt content: '{content}'.")
+        logger.debug(f"Successfully loaded prompt '{file_name}' ({len(content)} chars).")
         return content
 
     except FileNotFoundError:
-        # This case is technically covered by the is_file() check,
-        # but kept for robustness.
+        # The file can still disappear between the stat and the read.
         logger.warning(f"Prompt file not found (FileNotFoundError): {prompt_path}")
         return None
     except IOError as e:
@@ -0,0 +1,335 @@
+"""
+Helpers shared by the stock earnings workflows (plain and CrewAI): the prompts,
+JSON extraction from LLM replies and the bounds applied to direct LLM calls.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List, Tuple
+
+try:  # Optional C-accelerated JSON codec
+    import orjson
+except ImportError:  # pragma: no cover - falls back to stdlib json
+    orjson = None
+
+import openai
+
+# Every API call is bounded so one slow or verbose provider cannot stall the run
+LLM_TIMEOUT_SECONDS = 30
+LLM_MAX_ATTEMPTS = 3
+# Rate limits, timeouts and dropped connections are worth another try; nothing else is
+_TRANSIENT_API_ERRORS = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError)
+# Upper bound on API calls in flight at once; keep within the providers' rate limits
+API_CONCURRENCY = 4
+# o-series reasoning models (ChatGPT's "reasoning" o3-mini) count hidden reasoning tokens
+# against max_tokens and think before the first token, so on top of the reply caps below
+# they get this much headroom, low reasoning effort and a longer timeout
+_REASONING_MODEL_RE = re.compile(r"o\d")
+REASONING_TOKEN_HEADROOM = 8192
+REASONING_TIMEOUT_SECONDS = 120
+# Reply caps per call type; the replies are compact JSON, so these only cut off runaways.
+# The screener's cap scales with the rows it is asked for: SCREEN_BASE_TOKENS for the array and
+# any fence plus SCREEN_TOKENS_PER_ITEM per row (bounded_llm adds reasoning headroom on top)
+SCREEN_BASE_TOKENS = 256
+SCREEN_TOKENS_PER_ITEM = 80
+ANALYSIS_MAX_TOKENS = 512
+SELECTION_MAX_TOKENS = 512
+PREDICTION_MAX_TOKENS = 1024
+# Parsed replies are reused for this long; earnings analyses hold within a trading day
+RESULT_CACHE_TTL_SECONDS = 6 * 60 * 60
+RESULT_CACHE_SIZE = 512
+# The analysis fields the top-2 selector weighs, and the most of them (in characters) its prompt carries
+SELECTION_FIELDS = ("symbol", "bullish_thesis", "key_catalysts", "target_price", "bullish_probability")
+SELECTION_PAYLOAD_MAX_CHARS = 12000
+# A fenced ```json block's inner text; outside fences a bracket scan finds the JSON
+_FENCED_JSON_RE = re.compile(r"```json\s*([\s\S]*?)\s*```")
+# Characters that matter when scanning for a balanced JSON value
+_JSON_STRUCTURE_RE = re.compile(r'[{}\[\]"\\]')
+
+
+@dataclass
+class StockPick:
+    symbol: str
+    name: str | None = None
+    market_cap_category: str | None = None  # mid, large
+
+
+# (name, prompt digest) -> (expiry time, parsed reply); shared by both workflows within the process
+_RESULT_CACHE: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _result_cache_key(name: str, prompt: str) -> Tuple[str, str]:
+    return name, hashlib.sha1(prompt.encode("utf-8")).hexdigest()
+
+
+def cached_result(name: str, prompt: str) -> Any:
+    """
+    Return the reply cached for ``name`` (e.g. a symbol) and ``prompt``, or None.
+
+    Entries older than RESULT_CACHE_TTL_SECONDS are dropped on lookup; a hit is
+    marked most recently used.
+    """
+    key = _result_cache_key(name, prompt)
+    with _RESULT_CACHE_LOCK:
+        entry = _RESULT_CACHE.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _RESULT_CACHE[key]
+            return None
+        _RESULT_CACHE.move_to_end(key)
+        return entry[1]
+
+
+def cache_result(name: str, prompt: str, value: Any) -> None:
+    """Cache a parsed reply, evicting the least recently used entry when full. Empty replies are not cached."""
+    if not value:
+        return
+    key = _result_cache_key(name, prompt)
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[key] = (time.monotonic() + RESULT_CACHE_TTL_SECONDS, value)
+        _RESULT_CACHE.move_to_end(key)
+        if len(_RESULT_CACHE) > RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+
+
+def _is_reasoning_model(llm: Any) -> bool:
+    name = str(getattr(llm, "model_name", None) or getattr(llm, "model", None) or "")
+    return _REASONING_MODEL_RE.match(name.rsplit("/", 1)[-1]) is not None
+
+
+def bounded_llm(llm: Any, max_tokens: int) -> Any:
+    """
+    ``llm`` with its reply length and request time capped, retrying transient API errors.
+
+    ``max_tokens`` sizes the visible reply. Reasoning models are sent it plus
+    REASONING_TOKEN_HEADROOM, with ``reasoning_effort="low"`` and REASONING_TIMEOUT_SECONDS,
+    so their hidden reasoning does not use up the cap and leave an empty reply.
+
+    Rate limits, timeouts and dropped connections are retried with exponential backoff,
+    up to LLM_MAX_ATTEMPTS tries; anything else fails immediately.
+    """
+    if _is_reasoning_model(llm):
+        bound = llm.bind(
+            max_tokens=max_tokens + REASONING_TOKEN_HEADROOM,
+            reasoning_effort="low",
+            timeout=REASONING_TIMEOUT_SECONDS,
+        )
+    else:
+        bound = llm.bind(max_tokens=max_tokens, timeout=LLM_TIMEOUT_SECONDS)
+    return bound.with_retry(
+        retry_if_exception_type=_TRANSIENT_API_ERRORS,
+        wait_exponential_jitter=True,
+        stop_after_attempt=LLM_MAX_ATTEMPTS,
+    )
+
+
+def _safe_json_loads(text: str) -> dict | list | None:
+    try:
+        return orjson.loads(text) if orjson is not None else json.loads(text)
+    except Exception:
+        return None
+
+
+def _is_payload(value: Any) -> bool:
+    """Whether a decoded value is a reply payload: an object or a list of objects, not e.g. a citation like [1]."""
+    if isinstance(value, dict):
+        return True
+    return isinstance(value, list) and bool(value) and all(isinstance(item, dict) for item in value)
+
+
+def _json_span(text: str, pos: int = 0) -> Tuple[int, int] | None:
+    """
+    Locate the first balanced top-level ``{...}`` or ``[...]`` value in ``text`` at or after ``pos``.
+
+    Single forward pass that tracks bracket depth and skips brackets inside JSON
+    strings (honouring backslash escapes), so it never backtracks.
+
+    Returns:
+        (start, end) slice bounds of the value, or None if there is no balanced value.
+    """
+    starts = [found for found in (text.find("{", pos), text.find("[", pos)) if found != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    depth = 0
+    in_string = False
+    escaped_pos = -1
+    for match in _JSON_STRUCTURE_RE.finditer(text, start):
+        pos = match.start()
+        if pos == escaped_pos:
+            continue
+        char = match.group()
+        if in_string:
+            if char == "\\":
+                escaped_pos = pos + 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return start, pos + 1
+    return None
+
+
+def _json_dumps_compact(value: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _json_array_within(items: List[Any], max_chars: int) -> str:
+    """
+    Serialize ``items`` as a JSON array of at most ``max_chars`` characters.
+
+    Items are encoded one at a time and the array stops before the first one that
+    would not fit, so the result is always valid JSON and nothing past the budget
+    is encoded.
+    """
+    parts: List[str] = []
+    size = 2  # The enclosing brackets
+    for item in items:
+        encoded = _json_dumps_compact(item)
+        size += len(encoded) + (1 if parts else 0)
+        if size > max_chars:
+            break
+        parts.append(encoded)
+    return "[" + ",".join(parts) + "]"
+
+
+def extract_json_from_text(text: str) -> dict | list | None:
+    if not text:
+        return None
+    # Try to find a fenced code block with json
+    match = _FENCED_JSON_RE.search(text)
+    if match:
+        parsed = _safe_json_loads(match.group(1))
+        if parsed is not None:
+            return parsed
+    # Fallback: first balanced {...} or [...] holding objects; brackets in prose (citation
+    # marks such as [1]) are skipped by resuming the scan just past their opening bracket
+    span = _json_span(text)
+    while span:
+        parsed = _safe_json_loads(text[span[0]:span[1]])
+        if _is_payload(parsed):
+            return parsed
+        span = _json_span(text, span[0] + 1)
+    return _safe_json_loads(text)
+
+
+def stream_json(llm: Any, prompt: str) -> dict | list | None:
+    """
+    Stream ``llm``'s reply to ``prompt`` and decode the first JSON value as soon as it closes.
+
+    Chunks are scanned as they arrive with the same bracket tracking as ``_json_span``,
+    for a value that starts a line (a bare reply, or one inside a fence), so inline
+    brackets such as citation marks are not mistaken for it. Once a balanced value
+    decodes to an object (or a list of objects), the stream is closed so the rest of the generation (trailing commentary)
+    is not waited for. A reply without one falls back to ``extract_json_from_text`` on
+    the full text.
+
+    ``with_retry`` only covers ``invoke``, so transient API errors raised before the
+    first chunk are retried here with the same backoff and LLM_MAX_ATTEMPTS; once the
+    reply has started arriving, errors propagate.
+    """
+    for attempt in range(1, LLM_MAX_ATTEMPTS + 1):
+        parts: List[str] = []
+        try:
+            return _scan_json_stream(llm.stream(prompt), parts)
+        except _TRANSIENT_API_ERRORS:
+            if parts or attempt == LLM_MAX_ATTEMPTS:
+                raise
+            time.sleep(2 ** (attempt - 1) + random.uniform(0, 1))
+
+
+def _scan_json_stream(stream: Any, parts: List[str]) -> dict | list | None:
+    offset = 0
+    start = -1
+    depth = 0
+    in_string = False
+    escaped_pos = -1
+    try:
+        for chunk in stream:
+            piece = getattr(chunk, "content", chunk)
+            if not isinstance(piece, str):
+                piece = str(piece)
+            parts.append(piece)
+            for match in _JSON_STRUCTURE_RE.finditer(piece):
+                pos = offset + match.start()
+                if pos == escaped_pos:
+                    continue
+                char = match.group()
+                if in_string:
+                    if char == "\\":
+                        escaped_pos = pos + 1
+                    elif char == '"':
+                        in_string = False
+                elif start == -1:
+                    if char in "{[" and "".join(parts)[:pos].rstrip(" \t")[-1:] in ("", "\n"):
+                        start, depth = pos, 1
+                elif char == '"':
+                    in_string = True
+                elif char in "{[":
+                    depth += 1
+                elif char in "}]":
+                    depth -= 1
+                    if depth == 0:
+                        parsed = _safe_json_loads("".join(parts)[start:pos + 1])
+                        if _is_payload(parsed):
+                            return parsed
+                        start = -1  # Brackets in prose or a citation, not the reply; keep looking
+            offset += len(piece)
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+    return extract_json_from_text("".join(parts))
+
+
+def format_earnings_query_prompt(weeks: int = 3, desired_count: int = 10) -> str:
+    return (
+        "You are a financial research assistant. Return ONLY valid JSON. "
+        "Task: List publicly-traded US stocks with upcoming earnings in the next "
+        f"{weeks} weeks. Include symbol, company_name, earnings_date (YYYY-MM-DD), and market_cap_category (mid or large). "
+        f"Return a JSON array of exactly {desired_count} items, each mid or large cap only, "
+        "with keys: symbol, company_name, earnings_date, market_cap_category."
+    )
+
+
+def format_perplexity_bull_prompt(symbol: str, custom_prompt: str | None) -> str:
+    base = (
+        f"Perform a concise bullish-vs-bearish scenario analysis for {symbol}. "
+        "Focus on fundamentals, recent earnings trends, guidance, catalysts, risks. "
+        "Return ONLY JSON with keys: symbol, bullish_thesis, key_catalysts, target_price, target_horizon_days, bullish_probability, notes."
+    )
+    if custom_prompt:
+        base += "\nAdditional instructions: " + custom_prompt
+    return base
+
+
+def format_top2_selection_prompt(perplexity_json_payloads: List[dict]) -> str:
+    compact = [{key: payload.get(key) for key in SELECTION_FIELDS} for payload in perplexity_json_payloads]
+    return (
+        "You are screening stocks for near-term bullish potential. You will receive JSON analyses (one per stock).\n"
+        "Pick the two strongest bullish candidates using catalysts, probability, and upside.\n"
+        "Return ONLY JSON with this schema: {\"picks\":[{\"symbol\":str,\"reason\":str}],\"ranking\":[{\"symbol\":str,\"score\":number}]}.\n"
+        f"Analyses: {_json_array_within(compact, SELECTION_PAYLOAD_MAX_CHARS)}"
+    )
+
+
+def format_prediction_prompt(symbol: str) -> str:
+    return (
+        f"For {symbol}, predict a 30-day price target and percentage growth with probability bands.\n"
+        "Return ONLY JSON: {symbol, base_case_target, upside_target, downside_target, base_prob, upside_prob, downside_prob, assumptions}."
+    )
@@ -1,79 +1,76 @@
+import json
 import logging
-from pathlib import Path
+import re
+import sys
+from functools import lru_cache
 
 from langchain.chains.llm import LLMChain
-from langchain.chains.sequential import SequentialChain
 from langchain_core.prompts import PromptTemplate
 
 from src.ai_agentic_workflow.clients.chatgpt_client import DualModelChatClient
-from src.ai_agentic_workflow.clients.claude_client import DualModelClaudeClient
-from src.ai_agentic_workflow.clients.gemini_client import DualModelGeminiClient
-from src.ai_agentic_workflow.clients.perplexity_client import DualModelPerplexityClient
+from src.ai_agentic_workflow.utils.prompt_helper import get_prompt_content
 
 logger = logging.getLogger(__name__)
 
-# 1. Instantiate clients
-chat_client = DualModelChatClient()
-claude_client = DualModelClaudeClient()
-perplexity_client = DualModelPerplexityClient()
-gemini_client = DualModelGeminiClient()
+# Report rules for the __main__ printer, built once per process
+_BAR80 = "=" * 80
+_SEP80 = "-" * 80
+
+
+# 1. The chat client is created lazily on first use so importing this module stays cheap
+@lru_cache(maxsize=1)
+def _chat_client() -> DualModelChatClient:
+    return DualModelChatClient()
+
 
 # 2. Load prompt templates from files
-PACKAGE_ROOT = Path(__file__).resolve().parents[1]
-PROMPTS_DIR = PACKAGE_ROOT / "prompts"
-# 2) Read in your prompt files by constructing absolute paths
-breakdown_path = PROMPTS_DIR / "breakdown_prompt.txt"
-summary_path = PROMPTS_DIR / "summary_prompt.txt"
-# 2) Read the raw text into its own variable
-breakdown_path = PROMPTS_DIR / "breakdown_prompt.txt"
-summary_path = PROMPTS_DIR / "summary_prompt.txt"
-
-with open(breakdown_path, "r", encoding="utf-8") as f:
-    breakdown_template = f.read()
-
-with open(summary_path, "r", encoding="utf-8") as f:
-    summary_template = f.read()
-
-breakdown_prompt = PromptTemplate(input_variables=["question"], template=breakdown_template)
-summary_prompt = PromptTemplate(
-    input_variables=["breakdown", "question"],
-    template=summary_template
-)
-
-# 3. Define chains
-# Use default reasoning model for breakdown
-breakdown_chain = LLMChain(
-    llm=chat_client.get_llm(),  # defaults to reasoning
-    prompt=breakdown_prompt,
-    output_key="breakdown"
-)
-
-# Use concept model for summary
-summary_chain = LLMChain(
-    llm=chat_client.get_llm(model_type="concept"),
-    prompt=summary_prompt,
-    output_key="summary"
-)
-
-# 4. Compose workflow
-workflow_chain = SequentialChain(
-    chains=[breakdown_chain, summary_chain],
-    input_variables=["question"],
-    output_variables=["breakdown", "summary"],
-    verbose=True
-)
+def _load_template(file_name: str) -> str:
+    template = get_prompt_content(file_name=file_name)
+    if template is None:
+        raise FileNotFoundError(f"Prompt file not found: {file_name}")
+    return template
+
+
+# 3. Define the chain (built once, on first run). Breakdown and summary are
+# produced together as JSON by the reasoning model in a single request.
+@lru_cache(maxsize=1)
+def _workflow_chain() -> LLMChain:
+    breakdown_summary_prompt = PromptTemplate(
+        input_variables=["question"],
+        template=_load_template("breakdown_summary_prompt.txt")
+    )
+    return LLMChain(
+        llm=_chat_client().get_llm(),  # defaults to reasoning
+        prompt=breakdown_summary_prompt,
+        output_key="breakdown_summary",
+        verbose=logger.isEnabledFor(logging.DEBUG)
+    )
+
+
+# 4. Parse the combined output
+def _parse_breakdown_summary(raw_output: str) -> dict:
+    """Extracts the breakdown and summary fields from the model's JSON reply."""
+    json_match = re.search(r"\{.*\}", raw_output, re.DOTALL)
+    try:
+        parsed = json.loads(json_match.group() if json_match else raw_output)
+        return {"breakdown": str(parsed.get("breakdown", "")), "summary": str(parsed.get("summary", ""))}
+    except (json.JSONDecodeError, AttributeError) as e:
+        logger.warning(f"Could not parse breakdown/summary JSON, using raw output as breakdown: {e}")
+        return {"breakdown": raw_output, "summary": ""}
 
 
 # 5. Basic entrypoint
 def run_basic(question: str) -> dict:
     """Runs the basic workflow and returns breakdown and summary."""
     logger.info(f"Starting basic workflow for question: {question!r}")
-    outputs = workflow_chain.invoke({"question": question})
+    result = _workflow_chain().invoke({"question": question})
+    outputs = {"question": question, **_parse_breakdown_summary(result.get("breakdown_summary", ""))}
 
     # --- FIX ---
     # Log both outputs if desired
-    logger.info(f"Breakdown: {outputs['breakdown'][:100]}...")
-    logger.info(f"Summary: {outputs['summary'][:100]}...")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"Breakdown: {outputs['breakdown'][:100]}...")
+        logger.info(f"Summary: {outputs['summary'][:100]}...")
 
     # Return the whole dictionary containing both 'breakdown' and 'summary'
     return outputs
@@ -86,32 +83,24 @@ if __name__ == '__main__':
     # 2. Run the workflow and get the results dictionary
     response_data = run_basic(input_question)
 
-    # 3. Format and print the output in sections
-    box_width = 80  # Adjust width as needed
-    separator = "-" * box_width
-
-    print("\n" + "=" * box_width)
-    print(" W O R K F L O W   O U T P U T")
-    print("=" * box_width)
-
-    # Section: Original Question
-    print("\n[ Input Question ]")
-    print(separator)
-    print(input_question)  # Use the original input variable
-
-    # Section: Breakdown
-    # Use .get() with a default value in case the key is missing for some reason
+    # 3. Format the output in sections and write it in one go
+    # Use .get() with a default value in case a key is missing for some reason
     breakdown_output = response_data.get('breakdown', '--- Breakdown not generated ---')
-    print("\n[ Generated Breakdown (Reasoning Model) ]")
-    print(separator)
-    print(breakdown_output)
-
-    # Section: Summary
     summary_output = response_data.get('summary', '--- Summary not generated ---')
-    print("\n[ Generated Summary (Concept Model) ]")
-    print(separator)
-    print(summary_output)
 
-    print("\n" + "=" * box_width)  # Footer line
-    print(" E N D   O F   O U T P U T")
-    print("=" * box_width + "\n")
+    parts = [
+        "\n", _BAR80, "\n",
+        " W O R K F L O W   O U T P U T\n",
+        _BAR80, "\n",
+        # Section: Original Question
+        "\n[ Input Question ]\n", _SEP80, "\n", input_question, "\n",
+        # Section: Breakdown
+        "\n[ Generated Breakdown (Reasoning Model) ]\n", _SEP80, "\n", breakdown_output, "\n",
+        # Section: Summary
+        "\n[ Generated Summary (Reasoning Model) ]\n", _SEP80, "\n", summary_output, "\n",
+        # Footer
+        "\n", _BAR80, "\n",
+        " E N D   O F   O U T P U T\n",
+        _BAR80, "\n\n",
+    ]
+    sys.stdout.write("".join(parts))
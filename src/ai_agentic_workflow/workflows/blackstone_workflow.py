@@ -1,9 +1,14 @@
+import asyncio
 import logging
-import re
+import sys
+from functools import lru_cache
 from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 from langchain.chains.llm import LLMChain
 from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel, Field
 
 # Assuming your clients are accessible, adjust imports if needed
 from src.ai_agentic_workflow.clients.chatgpt_client import DualModelChatClient
@@ -17,27 +22,35 @@ logger = logging.getLogger(__name__)
 # --- Configuration ---
 PACKAGE_ROOT = Path(__file__).resolve().parents[1]
 PROMPTS_DIR = PACKAGE_ROOT / "prompts"
+# Upper bound on concurrent data-simulation calls, to stay within provider rate limits
+MAX_SIMULATION_CONCURRENCY = 8
 
 # Use one client for simplicity, or swap as needed
-# Choose the client you want to use primarily
-llm_client = DualModelChatClient(
-    reasoning_model="gpt-4o-mini",  # Or your preferred reasoning model
-    concept_model="gpt-3.5-turbo"  # Or your preferred concept model
-)
+# Choose the client you want to use primarily. Its models hold async HTTP clients tied to the
+# event loop they first run on, so a client is created per event loop (see get_chains)
+def _new_llm_client() -> DualModelChatClient:
+    return DualModelChatClient(
+        reasoning_model="gpt-4o-mini",  # Or your preferred reasoning model
+        concept_model="gpt-3.5-turbo"  # Or your preferred concept model
+    )
+    # return DualModelClaudeClient()
+    # return DualModelGeminiClient()
+    # return DualModelPerplexityClient()
 
 
-# llm_client = DualModelClaudeClient()
-# llm_client = DualModelGeminiClient()
-# llm_client = DualModelPerplexityClient()
+# --- Load Prompts ---
+@lru_cache(maxsize=None)
+def _read_prompt(filename: str, mtime: float) -> str:
+    """Reads a prompt file; cached per (filename, mtime) so edited files are re-read."""
+    with open(PROMPTS_DIR / filename, "r", encoding="utf-8") as f:
+        return f.read()
 
 
-# --- Load Prompts ---
 def load_prompt(filename: str) -> str:
     """Loads a prompt template from the specified file."""
     try:
         prompt_path = PROMPTS_DIR / filename
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            return f.read()
+        return _read_prompt(filename, prompt_path.stat().st_mtime)
     except FileNotFoundError:
         logger.error(f"Prompt file not found: {prompt_path}")
         raise
@@ -46,129 +59,234 @@ def load_prompt(filename: str) -> str:
         raise
 
 
-enhancer_template_str = load_prompt("blackstone_enhancer_prompt.txt")
-breakdown_template_str = load_prompt("blackstone_breakdown_prompt.txt")
-data_sim_template_str = load_prompt("blackstone_data_simulator_prompt.txt")
-synthesizer_template_str = load_prompt("blackstone_synthesizer_prompt.txt")
-
-# --- Create Prompt Templates ---
-enhancer_prompt = PromptTemplate(
-    input_variables=["user_request"], template=enhancer_template_str
-)
-breakdown_prompt = PromptTemplate(
-    input_variables=["enhanced_request"], template=breakdown_template_str
-)
-data_sim_prompt = PromptTemplate(
-    input_variables=["enhanced_request", "data_task"], template=data_sim_template_str
-)
-synthesizer_prompt = PromptTemplate(
-    input_variables=["enhanced_request", "simulated_data_results"],
-    template=synthesizer_template_str
-)
+# --- Structured Outputs ---
+class EnhancedBreakdown(BaseModel):
+    """Enhanced CIO-level request together with the data tasks needed to answer it."""
+    enhanced_request: str = Field(description="The user's request reframed as the CIO would ask it.")
+    data_tasks: List[str] = Field(description="Actionable data gathering or calculation tasks, in order.")
+
 
 # --- Create Chains ---
-# Use reasoning model for enhancement and breakdown (more complex tasks)
-enhancer_chain = LLMChain(
-    llm=llm_client.get_llm(model_type="reasoning"),  # Or choose specific model
-    prompt=enhancer_prompt,
-    output_key="enhanced_request"
-)
-
-breakdown_chain = LLMChain(
-    llm=llm_client.get_llm(model_type="reasoning"),
-    prompt=breakdown_prompt,
-    output_key="data_tasks_str"  # Output will be a string list of tasks
-)
+# Prompt templates are built once, on first use, and reused for the whole process; the
+# chains around them are built per event loop, with that loop's LLM client.
+
+@lru_cache(maxsize=1)
+def _enhance_breakdown_prompt() -> PromptTemplate:
+    return PromptTemplate(
+        input_variables=["user_request"],
+        template=load_prompt("blackstone_enhance_breakdown_prompt.txt")
+    )
+
+
+@lru_cache(maxsize=1)
+def _data_sim_prompt() -> PromptTemplate:
+    return PromptTemplate(
+        input_variables=["enhanced_request", "data_task"],
+        template=load_prompt("blackstone_data_simulator_prompt.txt")
+    )
+
+
+@lru_cache(maxsize=1)
+def _synthesizer_prompt() -> PromptTemplate:
+    return PromptTemplate(
+        input_variables=["enhanced_request", "simulated_data_results"],
+        template=load_prompt("blackstone_synthesizer_prompt.txt")
+    )
+
+
+# Use reasoning model for enhancement and breakdown (more complex tasks). Both are
+# produced by one structured call, returning an EnhancedBreakdown instance.
+def enhance_breakdown_chain(llm_client: DualModelChatClient) -> Runnable:
+    return _enhance_breakdown_prompt() | llm_client.get_llm(
+        model_type="reasoning"
+    ).with_structured_output(EnhancedBreakdown)
+
 
 # Use concept model for simulation and synthesis (more generative tasks)
-data_sim_chain = LLMChain(
-    llm=llm_client.get_llm(model_type="concept"),
-    prompt=data_sim_prompt
-    # Output key isn't fixed here as we call it in a loop
-)
+def data_sim_chain(llm_client: DualModelChatClient) -> LLMChain:
+    return LLMChain(
+        llm=llm_client.get_llm(model_type="concept"),
+        prompt=_data_sim_prompt()
+        # Output key isn't fixed here as we call it in a loop
+    )
+
 
-synthesizer_chain = LLMChain(
-    llm=llm_client.get_llm(model_type="concept"),  # Or reasoning if complex synthesis needed
-    prompt=synthesizer_prompt,
-    output_key="final_summary"
-)
+def synthesizer_chain(llm_client: DualModelChatClient) -> LLMChain:
+    return LLMChain(
+        llm=llm_client.get_llm(model_type="concept"),  # Or reasoning if complex synthesis needed
+        prompt=_synthesizer_prompt(),
+        output_key="final_summary"
+    )
+
+
+# The chains built for the most recent event loop, with that loop
+_chains: Optional[Tuple[asyncio.AbstractEventLoop, Tuple[Runnable, LLMChain, LLMChain]]] = None
+
+
+async def get_chains() -> Tuple[Runnable, LLMChain, LLMChain]:
+    """
+    Returns the (enhance_breakdown, data_sim, synthesizer) chains for the running event loop.
+
+    The chains' async clients cannot outlive the loop they were first used on, and
+    run_blackstone_workflow_sync starts a new loop per call, so the chains and their
+    LLM client are rebuilt whenever the loop changes. The prompt templates are read once
+    per process, in worker threads so the file reads never block the event loop.
+    """
+    global _chains
+    loop = asyncio.get_running_loop()
+    if _chains is None or _chains[0] is not loop:
+        llm_client, *_ = await asyncio.gather(
+            asyncio.to_thread(_new_llm_client),
+            asyncio.to_thread(_enhance_breakdown_prompt),
+            asyncio.to_thread(_data_sim_prompt),
+            asyncio.to_thread(_synthesizer_prompt),
+        )
+        _chains = (loop, (
+            enhance_breakdown_chain(llm_client),
+            data_sim_chain(llm_client),
+            synthesizer_chain(llm_client),
+        ))
+    return _chains[1]
+
+
+# Report rules for the __main__ printer, built once per process
+_BAR100 = "=" * 100
+_SEP100 = "-" * 100
+_HALF100 = "-" * 50  # Between simulated results
 
 
 # --- Workflow Function ---
-def run_blackstone_workflow(user_request: str) -> dict:
+def _strip_task_number(task: str) -> str:
+    """Removes a leading list enumerator ("1.", "2)") the model sometimes keeps on task entries."""
+    line = task.lstrip()
+    i = 0
+    while i < len(line) and line[i].isdigit():
+        i += 1
+    # Only a number followed by "." or ")" and then whitespace counts, so "3.5% yield" is kept
+    if i and line[i:i + 1] in (".", ")") and line[i + 1:i + 2] in ("", " ", "\t"):
+        return line[i + 1:].lstrip()
+    return task
+
+
+def _normalize_task(task: str) -> str:
+    """Case- and whitespace-insensitive key used to spot duplicate data tasks."""
+    return " ".join(task.lower().split())
+
+
+def _format_simulation(task: str, output: Optional[str]) -> str:
+    """Formats one simulated task result block; a None output marks a failed simulation."""
+    if output is None:
+        return f"--- Task: {task}\nResult: Error during simulation ---\n"
+    return f"--- Task: {task}\nResult:\n{output}\n---"
+
+
+async def _enhance_and_simulate(user_request: str, full_results: dict,
+                                enhance_chain: Runnable, sim_chain: LLMChain) -> Optional[Dict[str, str]]:
+    """
+    Runs steps 1-3 (enhance + breakdown, then simulate), recording progress in full_results.
+
+    Returns:
+        The synthesizer inputs, or None when synthesis is skipped and
+        full_results already holds the final summary.
+    """
+    # 1-2. Enhance Prompt and Break Down into Data Tasks
+    logger.info("Step 1-2: Enhancing prompt and breaking it down into data tasks...")
+    enhanced_breakdown = await enhance_chain.ainvoke({"user_request": user_request})
+    enhanced_request = enhanced_breakdown.enhanced_request.strip()
+    if not enhanced_request:
+        raise ValueError("Prompt enhancement failed.")
+    full_results["enhanced_request"] = enhanced_request
+    logger.info(f"Enhanced Request: {enhanced_request}")
+
+    tasks = [_strip_task_number(task) for task in enhanced_breakdown.data_tasks]
+    if not tasks:
+        raise ValueError("Task breakdown failed.")
+    data_tasks_str = "\n".join(f"{i}. {task}" for i, task in enumerate(tasks, 1))
+    full_results["data_tasks_list_str"] = data_tasks_str
+    full_results["parsed_tasks"] = tasks
+    logger.info(f"Data Tasks Identified ({len(tasks)}):\n{data_tasks_str}")
+
+    # 3. Simulate Data Gathering (batched)
+    logger.info(f"Step 3: Simulating data gathering for {len(tasks)} tasks...")
+    clean_tasks = [task.strip() for task in tasks if task.strip()]
+    # Tasks that only differ in case or whitespace are simulated once and share the result
+    task_slots: Dict[str, List[int]] = {}
+    for index, task in enumerate(clean_tasks):
+        task_slots.setdefault(_normalize_task(task), []).append(index)
+    unique_slots = list(task_slots.values())
+    if len(unique_slots) < len(clean_tasks):
+        logger.info(f"  {len(clean_tasks) - len(unique_slots)} duplicate task(s) will reuse earlier simulations.")
+    sim_inputs = [
+        {"enhanced_request": enhanced_request, "data_task": clean_tasks[slots[0]]} for slots in unique_slots
+    ]
+    # Results are collected as each task finishes rather than after the slowest one
+    sim_results: List[object] = [None] * len(sim_inputs)
+    completed = 0
+    async for unique_index, sim_result in sim_chain.abatch_as_completed(
+        sim_inputs, config={"max_concurrency": MAX_SIMULATION_CONCURRENCY}, return_exceptions=True
+    ):
+        sim_results[unique_index] = sim_result
+        completed += 1
+        logger.info(f"  Finished simulation {completed}/{len(sim_inputs)}: {sim_inputs[unique_index]['data_task']}")
+
+    # Single post-pass: fan each result out to its task slots as (task, output) pairs,
+    # with a None output marking a failed simulation
+    raw_results: List[Tuple[str, Optional[str]]] = [(task, None) for task in clean_tasks]
+    for sim_input, slots, sim_result in zip(sim_inputs, unique_slots, sim_results):
+        if isinstance(sim_result, Exception):
+            logger.error(f"Error simulating data for task '{sim_input['data_task']}': {sim_result}")
+            continue
+        # LLMChain returns dict, get the text output (Langchain updates changed this)
+        sim_output = sim_result.get(sim_chain.output_key, "Simulation failed").strip()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"  Simulation result for '{sim_input['data_task']}': {sim_output}")
+        for index in slots:
+            raw_results[index] = (clean_tasks[index], sim_output)
+
+    simulated_data = [_format_simulation(task, output) for task, output in raw_results]
+    full_results["simulated_data_outputs"] = simulated_data
+    simulated_data_results_str = "\n".join(simulated_data)
+    logger.info("Data simulation complete.")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Combined Simulated Data:\n{simulated_data_results_str}")
+
+    # Nothing to combine for a single simulated result, so it becomes the final summary
+    if len(raw_results) <= 1:
+        single_output = raw_results[0][1] if raw_results else None
+        full_results["final_summary"] = single_output or "No data could be simulated."
+        logger.info("Step 4: Skipping synthesis, at most one task was simulated.")
+        return None
+
+    return {"enhanced_request": enhanced_request, "simulated_data_results": simulated_data_results_str}
+
+
+async def run_blackstone_workflow(user_request: str) -> dict:
     """
-    Runs the Blackstone-style workflow: Enhance -> Breakdown -> Simulate -> Synthesize.
+    Runs the Blackstone-style workflow: Enhance + Breakdown -> Simulate -> Synthesize.
+
+    Enhancement and breakdown share a single structured LLM call. Data
+    simulations for the parsed tasks are independent, so they are sent as
+    one batch (at most MAX_SIMULATION_CONCURRENCY in flight at a time) and
+    each result is recorded as soon as its task completes, in task order.
+    When at most one task was simulated there is nothing to synthesize, so
+    its output is returned as the final summary without a synthesizer call.
     """
     logger.info(f"Starting Blackstone workflow for request: {user_request!r}")
     full_results = {"initial_request": user_request}
 
     try:
-        # 1. Enhance Prompt
-        logger.info("Step 1: Enhancing prompt...")
-        enhancer_result = enhancer_chain.invoke({"user_request": user_request})
-        enhanced_request = enhancer_result.get("enhanced_request", "").strip()
-        if not enhanced_request:
-            raise ValueError("Prompt enhancement failed.")
-        full_results["enhanced_request"] = enhanced_request
-        logger.info(f"Enhanced Request: {enhanced_request}")
-
-        # 2. Breakdown Task
-        logger.info("Step 2: Breaking down enhanced request into data tasks...")
-        breakdown_result = breakdown_chain.invoke({"enhanced_request": enhanced_request})
-        data_tasks_str = breakdown_result.get("data_tasks_str", "").strip()
-        if not data_tasks_str:
-            raise ValueError("Task breakdown failed.")
-        full_results["data_tasks_list_str"] = data_tasks_str
-        logger.info(f"Data Tasks Identified (raw):\n{data_tasks_str}")
-
-        # Simple parsing of numbered list (adjust regex if format differs)
-        # This regex looks for lines starting with a number and a dot/parenthesis.
-        tasks = re.findall(r"^\s*\d+[.)]?\s*(.*)", data_tasks_str, re.MULTILINE)
-        if not tasks:
-            logger.warning("Could not parse tasks from breakdown string, treating as one task.")
-            tasks = [data_tasks_str]  # Fallback: treat the whole string as one task
-        full_results["parsed_tasks"] = tasks
-        logger.info(f"Parsed {len(tasks)} tasks.")
-
-        # 3. Simulate Data Gathering (Loop)
-        logger.info(f"Step 3: Simulating data gathering for {len(tasks)} tasks...")
-        simulated_data = []
-        for i, task in enumerate(tasks):
-            task = task.strip()
-            if not task: continue
-            logger.debug(f"  Simulating task {i + 1}/{len(tasks)}: {task}")
-            try:
-                sim_result = data_sim_chain.invoke({
-                    "enhanced_request": enhanced_request,
-                    "data_task": task
-                })
-                # LLMChain returns dict, get the text output (Langchain updates changed this)
-                sim_output = sim_result.get(data_sim_chain.output_key, "Simulation failed")
-                simulated_data.append(f"--- Task: {task}\nResult:\n{sim_output.strip()}\n---")
-                logger.debug(f"  Simulation result: {sim_output.strip()}")
-            except Exception as sim_e:
-                logger.error(f"Error simulating data for task '{task}': {sim_e}")
-                simulated_data.append(f"--- Task: {task}\nResult: Error during simulation ---\n")
-
-        full_results["simulated_data_outputs"] = simulated_data
-        simulated_data_results_str = "\n".join(simulated_data)
-        logger.info("Data simulation complete.")
-        logger.debug(f"Combined Simulated Data:\n{simulated_data_results_str}")
+        enhance_chain, sim_chain, synth_chain = await get_chains()
+        synthesizer_inputs = await _enhance_and_simulate(user_request, full_results, enhance_chain, sim_chain)
 
         # 4. Synthesize Results
-        logger.info("Step 4: Synthesizing final summary...")
-        if not simulated_data_results_str:
-            simulated_data_results_str = "No data could be simulated."
-
-        synthesizer_result = synthesizer_chain.invoke({
-            "enhanced_request": enhanced_request,
-            "simulated_data_results": simulated_data_results_str
-        })
-        final_summary = synthesizer_result.get("final_summary", "").strip()
-        if not final_summary:
-            raise ValueError("Final synthesis failed.")
-        full_results["final_summary"] = final_summary
-        logger.info(f"Final Summary:\n{final_summary}")
+        if synthesizer_inputs is not None:
+            logger.info("Step 4: Synthesizing final summary...")
+            synthesizer_result = await synth_chain.ainvoke(synthesizer_inputs)
+            final_summary = synthesizer_result.get("final_summary", "").strip()
+            if not final_summary:
+                raise ValueError("Final synthesis failed.")
+            full_results["final_summary"] = final_summary
+            logger.info(f"Final Summary:\n{final_summary}")
 
         logger.info("Blackstone workflow finished successfully.")
         return full_results
@@ -179,6 +297,54 @@ def run_blackstone_workflow(user_request: str) -> dict:
         return full_results
 
 
+async def run_blackstone_workflow_streaming(user_request: str) -> AsyncIterator[dict]:
+    """
+    Streaming variant of run_blackstone_workflow.
+
+    Steps 1-3 run exactly as in run_blackstone_workflow; the synthesizer
+    output is then streamed so callers can show it while it is generated.
+
+    Yields:
+        {"final_summary_chunk": str} for each piece of the final summary, then
+        one last dict with the full results (same shape as run_blackstone_workflow).
+    """
+    logger.info(f"Starting Blackstone workflow (streaming) for request: {user_request!r}")
+    full_results = {"initial_request": user_request}
+
+    try:
+        enhance_chain, sim_chain, synth_chain = await get_chains()
+        synthesizer_inputs = await _enhance_and_simulate(user_request, full_results, enhance_chain, sim_chain)
+
+        # 4. Synthesize Results, streaming from the underlying model
+        if synthesizer_inputs is None:
+            yield {"final_summary_chunk": full_results["final_summary"]}
+        else:
+            logger.info("Step 4: Synthesizing final summary (streaming)...")
+            summary_parts = []
+            async for chunk in (synth_chain.prompt | synth_chain.llm).astream(synthesizer_inputs):
+                # Chat models stream message chunks, completion models stream plain strings
+                text = getattr(chunk, "content", chunk)
+                if text:
+                    summary_parts.append(text)
+                    yield {"final_summary_chunk": text}
+            final_summary = "".join(summary_parts).strip()
+            if not final_summary:
+                raise ValueError("Final synthesis failed.")
+            full_results["final_summary"] = final_summary
+
+        logger.info("Blackstone workflow finished successfully.")
+    except Exception as e:
+        logger.error(f"Blackstone workflow failed: {e}", exc_info=True)
+        full_results["error"] = str(e)
+
+    yield full_results
+
+
+def run_blackstone_workflow_sync(user_request: str) -> dict:
+    """Blocking wrapper around run_blackstone_workflow for scripts and sync callers."""
+    return asyncio.run(run_blackstone_workflow(user_request))
+
+
 # --- Entry Point ---
 if __name__ == '__main__':
     # Configure logging for detailed output
@@ -189,47 +355,39 @@ if __name__ == '__main__':
     # initial_prompt = "What's the exposure to the tech sector across Fund III and Fund IV?"
     # initial_prompt = "Summarize recent performance of our European real estate assets."
 
-    results = run_blackstone_workflow(initial_prompt)
-
-    # --- Formatted Output ---
-    box_width = 100
-    separator = "-" * box_width
-
-    print("\n\n" + "=" * box_width)
-    print(" B L A C K S T O N E   W O R K F L O W   R E S U L T S")
-    print("=" * box_width)
-
-    print(f"\n[ 1. Initial User Request ]")
-    print(separator)
-    print(results.get('initial_request', 'N/A'))
-
-    print(f"\n[ 2. Enhanced CIO Request ]")
-    print(separator)
-    print(results.get('enhanced_request', '--- Enhancement Failed ---'))
-
-    print(f"\n[ 3. Identified Data Tasks ]")
-    print(separator)
-    print(results.get('data_tasks_list_str', '--- Breakdown Failed ---'))  # Show raw breakdown list
-
-    print(f"\n[ 4. Simulated Data Gathering Results ]")
-    print(separator)
+    results = run_blackstone_workflow_sync(initial_prompt)
+
+    # --- Formatted Output (built in memory, written once) ---
+    parts = [
+        "\n\n", _BAR100, "\n",
+        " B L A C K S T O N E   W O R K F L O W   R E S U L T S\n",
+        _BAR100, "\n",
+        "\n[ 1. Initial User Request ]\n", _SEP100, "\n",
+        results.get('initial_request', 'N/A'), "\n",
+        "\n[ 2. Enhanced CIO Request ]\n", _SEP100, "\n",
+        results.get('enhanced_request', '--- Enhancement Failed ---'), "\n",
+        "\n[ 3. Identified Data Tasks ]\n", _SEP100, "\n",
+        results.get('data_tasks_list_str', '--- Breakdown Failed ---'), "\n",  # Show numbered task list
+        "\n[ 4. Simulated Data Gathering Results ]\n", _SEP100, "\n",
+    ]
     if 'simulated_data_outputs' in results:
-        # Print each simulated result clearly
+        # Each simulated result followed by a small separator between items
         for item in results['simulated_data_outputs']:
-            print(item)
-            print("-" * (box_width // 2))  # Small separator between items
+            parts += (item, "\n", _HALF100, "\n")
     else:
-        print("--- Simulation Failed or Skipped ---")
+        parts.append("--- Simulation Failed or Skipped ---\n")
 
-    print(f"\n[ 5. Final Synthesized Summary for CIO ]")
-    print(separator)
-    print(results.get('final_summary', '--- Synthesis Failed ---'))
+    parts += (
+        "\n[ 5. Final Synthesized Summary for CIO ]\n", _SEP100, "\n",
+        results.get('final_summary', '--- Synthesis Failed ---'), "\n",
+    )
 
     if 'error' in results:
-        print(f"\n[ WORKFLOW ERROR ]")
-        print(separator)
-        print(results['error'])
-
-    print("\n" + "=" * box_width)
-    print(" E N D   O F   W O R K F L O W   R E S U L T S")
-    print("=" * box_width + "\n")
+        parts += ("\n[ WORKFLOW ERROR ]\n", _SEP100, "\n", results['error'], "\n")
+
+    parts += (
+        "\n", _BAR100, "\n",
+        " E N D   O F   W O R K F L O W   R E S U L T S\n",
+        _BAR100, "\n\n",
+    )
+    sys.stdout.write("".join(parts))
@@ -5,34 +5,308 @@ Generates authentic, engaging technical blogs based on personal experience and t
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
 import re
-from dataclasses import dataclass
-from typing import Dict, Any, List, Optional, Tuple
-
-from crewai import Task, Crew, Process
-
-from src.ai_agentic_workflow.agents.blog_alchemist_agent import get_blog_alchemist_agent, get_blog_alchemist_prompt
-from src.ai_agentic_workflow.agents.blog_craftsman_agent import get_blog_craftsman_agent, get_blog_craftsman_prompt
-from src.ai_agentic_workflow.agents.blog_critic_agent import get_blog_critic_agent, get_blog_critic_prompt
-from src.ai_agentic_workflow.agents.community_connector_agent import get_community_connector_agent, \
-    get_community_connector_prompt
-# Import the refactored agents and their prompt functions
-from src.ai_agentic_workflow.agents.profile_analyst_agent import get_profile_analyst_agent, get_profile_analyst_prompt, user_profile_analysis
-from src.ai_agentic_workflow.agents.story_architect_agent import get_story_architect_agent, get_story_architect_prompt
-from src.ai_agentic_workflow.agents.style_decoder_agent import get_style_decoder_agent, get_style_decoder_prompt
-from src.ai_agentic_workflow.agents.trend_scout_agent import get_trend_scout_agent, get_trend_scout_prompt
-from src.ai_agentic_workflow.clients.perplexity_client import DualModelPerplexityClient
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Tuple
+
+try:  # Optional C-accelerated JSON codec
+    import orjson
+except ImportError:  # pragma: no cover - falls back to stdlib json
+    orjson = None
+
+if TYPE_CHECKING:  # CrewAI, agents and clients are imported on first use to keep module import cheap
+    from crewai import Task
+
+    from src.ai_agentic_workflow.clients.perplexity_client import DualModelPerplexityClient
+
 from src.ai_agentic_workflow.utils.logging_config import setup_logging
 
-setup_logging(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+def _dumps(obj: Any) -> str:
+    """Serialize ``obj`` to a JSON string, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def _loads(text: str) -> Any:
+    """Parse a JSON string, using orjson when available (its errors subclass json.JSONDecodeError)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+# Characters that matter when scanning for a JSON object; everything else is skipped in C
+_JSON_STRUCTURE_RE = re.compile(r'[{}"\\]')
+# Appended to expected outputs (which CrewAI puts in the prompt): output tokens dominate
+# latency, so replies are asked to carry nothing beyond what the workflow parses
+_COMPACT_JSON = " Return only the compact JSON object: no markdown fences, commentary or indentation."
+_BLOG_LENGTH = " Keep it to 600-800 words with no preamble or closing commentary."
+# Shared decoder; raw_decode parses one value and ignores whatever follows it
+_JSON_DECODER = json.JSONDecoder()
+# Separator between upstream outputs handed to a task as context (as CrewAI joins them)
+_CONTEXT_DIVIDER = "\n\n----------\n\n"
+# Outputs longer than this are parsed off the event loop in the async stage executor
+_JSON_OFFLOAD_BYTES = 100_000
+
+
+def _json_object_span(text: str) -> Optional[Tuple[int, int]]:
+    """
+    Locate the first balanced top-level ``{...}`` block in ``text``.
+
+    Single forward pass that tracks brace depth and skips braces inside JSON
+    strings (honouring backslash escapes), so it never backtracks.
+
+    Returns:
+        (start, end) slice bounds of the block, or None if there is no balanced block.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    depth = 0
+    in_string = False
+    escaped_pos = -1
+    for match in _JSON_STRUCTURE_RE.finditer(text, start):
+        pos = match.start()
+        if pos == escaped_pos:
+            continue
+        char = match.group()
+        if in_string:
+            if char == "\\":
+                escaped_pos = pos + 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return start, pos + 1
+    return None
+
+
+# Raw outputs of agent calls keyed by a digest of (role, model, prompt, context), shared
+# by every workflow in the process so identical calls are made once
+_TASK_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_TASK_CACHE_SIZE = 256
+_TASK_CACHE_LOCK = threading.Lock()
+
+
+def _task_cache_key(task: Task, context: Optional[str] = None) -> str:
+    """Digest of the agent's role, its model, the task prompt and expected output, and any upstream context."""
+    agent = task.agent
+    llm = getattr(agent, "llm", None)
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (getattr(agent, "role", ""), str(model), task.description, task.expected_output, context or ""):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _cached_task_output(key: str) -> Optional[str]:
+    """Return a cached raw output, marking it most recently used."""
+    with _TASK_CACHE_LOCK:
+        raw = _TASK_CACHE.get(key)
+        if raw is not None:
+            _TASK_CACHE.move_to_end(key)
+        return raw
+
+
+def _cache_task_output(key: str, raw: str) -> None:
+    """Store a raw output, evicting the least recently used entry when full."""
+    with _TASK_CACHE_LOCK:
+        _TASK_CACHE[key] = raw
+        _TASK_CACHE.move_to_end(key)
+        if len(_TASK_CACHE) > _TASK_CACHE_SIZE:
+            _TASK_CACHE.popitem(last=False)
+
+
+def _unique(items: List[Any], key: Any = None) -> List[Any]:
+    """Return ``items`` without repeats (compared by ``key(item)``), keeping first occurrences."""
+    seen = set()
+    unique = []
+    for item in items:
+        marker = str(key(item) if key else item)
+        if marker not in seen:
+            seen.add(marker)
+            unique.append(item)
+    return unique
+
+
+def _review_score(review: Optional[Dict[str, Any]]) -> int:
+    """Return a review's overall score as an int; models sometimes send it as a string."""
+    try:
+        return round(float((review or {}).get("overall_score", 0)))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _aggregate_reviews(reviews: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge independent critic reviews into a single review.
+
+    The overall score is the mean of the critics' scores, and strengths and
+    improvement areas are the de-duplicated union in critic order. The remaining
+    fields come from the first review.
+    """
+    if len(reviews) == 1:
+        return reviews[0]
+    merged = dict(reviews[0])
+    merged["overall_score"] = round(sum(_review_score(review) for review in reviews) / len(reviews))
+    merged["strengths"] = _unique([s for review in reviews for s in review.get("strengths", [])])
+    merged["improvement_areas"] = _unique(
+        [area for review in reviews for area in review.get("improvement_areas", [])],
+        key=lambda area: area.get("issue") if isinstance(area, dict) else area,
+    )
+    return merged
+
+
+def _parse_json(raw_output: str) -> Dict[str, Any]:
+    """Parse the first JSON object in an LLM reply, tolerating fences and surrounding prose."""
+    # Markdown outputs (drafts, enhancements) never hold an object; skip the scans
+    start = raw_output.find("{")
+    if start == -1:
+        return {}
+    # Bare JSON replies decode directly, without fence stripping or brace scanning
+    stripped = raw_output.strip()
+    if stripped[0] == "{" and stripped[-1] == "}":
+        try:
+            return _loads(stripped)
+        except json.JSONDecodeError:
+            pass  # Fall through to the tolerant path below
+    try:
+        # One C-level pass from the first brace; it stops where the object ends, so
+        # surrounding fences and prose are never scanned or stripped
+        parsed, _ = _JSON_DECODER.raw_decode(raw_output, start)
+        return parsed
+    except json.JSONDecodeError as exc:  # pragma: no cover - robustness
+        logger.error("JSON parsing error: %s", exc)
+        logger.debug("Raw output: %s", raw_output)
+        # Attempt to take everything from the first '{' to the last '}' to salvage JSON
+        end = raw_output.rfind('}')
+        if start < end:
+            try:
+                return _loads(raw_output[start:end + 1])
+            except json.JSONDecodeError:
+                pass  # Failed again, return empty dict
+
+        return {}
+
+
+# Clients and agents are created once per process and shared by every workflow instance
+@lru_cache(maxsize=1)
+def _shared_perplexity_client() -> DualModelPerplexityClient:
+    from src.ai_agentic_workflow.clients.perplexity_client import DualModelPerplexityClient
+
+    return DualModelPerplexityClient(
+        reasoning_model="sonar-pro",
+        concept_model="sonar",
+        default_model="reasoning",
+    )
+
+
+def _create_agents(verbose: bool) -> Dict[str, Any]:
+    """Create the workflow's agents, keyed by the attribute names the workflow uses."""
+    from src.ai_agentic_workflow.agents.blog_alchemist_agent import get_blog_alchemist_agent
+    from src.ai_agentic_workflow.agents.blog_craftsman_agent import get_blog_craftsman_agent
+    from src.ai_agentic_workflow.agents.blog_critic_agent import get_blog_critic_agent
+    from src.ai_agentic_workflow.agents.community_connector_agent import get_community_connector_agent
+    from src.ai_agentic_workflow.agents.profile_analyst_agent import get_profile_analyst_agent
+    from src.ai_agentic_workflow.agents.story_architect_agent import get_story_architect_agent
+    from src.ai_agentic_workflow.agents.style_decoder_agent import get_style_decoder_agent
+    from src.ai_agentic_workflow.agents.trend_scout_agent import get_trend_scout_agent
+
+    agents: Dict[str, Any] = {
+        "profile_analyst": get_profile_analyst_agent(verbose=verbose),
+        "trend_scout": get_trend_scout_agent(verbose=verbose),
+        "story_architect": get_story_architect_agent(verbose=verbose),
+        "style_decoder": get_style_decoder_agent(verbose=verbose),
+        "blog_craftsman": get_blog_craftsman_agent(verbose=verbose),
+        "blog_critic": get_blog_critic_agent(verbose=verbose),
+        "blog_alchemist": get_blog_alchemist_agent(verbose=verbose),
+        "community_connector": get_community_connector_agent(verbose=verbose),
+    }
+    agents["blog_critics"] = _review_panel(agents["blog_critic"], verbose)
+    return agents
+
+
+# The process-wide agents (one set per verbosity), for workflows that run on one thread at a time
+_shared_agents = lru_cache(maxsize=2)(_create_agents)
 
-@dataclass
+
+@lru_cache(maxsize=128)
+def _fetch_profile(client: DualModelPerplexityClient, profile_url: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Ask Perplexity for a profile's summary and posts in one structured request.
+
+    Results are cached per client and URL, so iterating on the same profile does not
+    re-query Perplexity. Failures raise and are therefore never cached.
+    """
+    prompt = (
+        "Summarize the work experience, roles, responsibilities and skills from the "
+        "LinkedIn profile, and provide three representative posts or content snippets from it. "
+        'Return ONLY a JSON object with keys "summary" (string) and "posts" (array of strings). '
+        f"LinkedIn profile: {profile_url}"
+    )
+    logger.debug("[Perplexity] Requesting profile summary and posts with prompt: %s", prompt)
+    # Summary and posts come back together, one round-trip instead of two
+    message = client.get_llm().invoke(prompt)
+    text = str(getattr(message, "content", message))
+    logger.debug("[Perplexity] Received profile summary and posts: %s", text)
+    data = _parse_json(text)
+    if not data:
+        # Perplexity ignored the format; the whole reply still describes the profile
+        return text, ()
+    posts = data.get("posts") or []
+    return str(data.get("summary", "")), tuple(str(post) for post in posts[:10])
+
+
+def _review_panel(primary_critic: Any, verbose: bool) -> List[Any]:
+    """
+    Build the independent critics the review stage is scattered to.
+
+    The GPT-4 critic is always present; the Gemini critic is added when its client can
+    be created, otherwise the review runs without it. There is no Claude critic:
+    DualModelClaudeClient sends its requests to OpenAI, so it cannot reach Claude.
+    """
+    from src.ai_agentic_workflow.agents.blog_critic_agent import get_blog_critic_agent
+    from src.ai_agentic_workflow.clients.gemini_client import DualModelGeminiClient
+
+    panel = [primary_critic]
+    panel_llms = (
+        ("Gemini", lambda: DualModelGeminiClient(
+            reasoning_model="gemini-pro", concept_model="gemini-pro"
+        ).get_llm()),
+    )
+    for name, make_llm in panel_llms:
+        try:
+            panel.append(get_blog_critic_agent(llm=make_llm(), verbose=verbose))
+        except Exception as e:
+            logger.warning(f"{name} critic unavailable, reviewing without it: {e}")
+    return panel
+
+
+@dataclass(slots=True)
 class BlogProject:
-    """Central state object for blog creation workflow."""
+    """
+    Central state object for blog creation workflow.
+
+    Slotted, so instances carry no per-instance ``__dict__`` and attributes cannot be
+    added outside the declared fields.
+    """
 
     linkedin_profile: str
     expertise_profile: Optional[Dict[str, Any]] = None
@@ -41,6 +315,8 @@ class BlogProject:
     story_blueprint: Optional[Dict[str, Any]] = None
     style_guide: Optional[Dict[str, Any]] = None
     linkedin_posts: Optional[List[str]] = None
+    # Posts joined (and capped) once per run for the style prompt
+    linkedin_posts_text: Optional[str] = None
     blog_draft: Optional[str] = None
     review_feedback: Optional[Dict[str, Any]] = None
     enhanced_blog: Optional[str] = None
@@ -48,6 +324,28 @@ class BlogProject:
     community_resources: Optional[Dict[str, Any]] = None
     attempts: int = 0
     final_score: int = 0
+    # Encoded JSON per field, paired with the value it was encoded from (not an init
+    # field, so checkpoints leave it out)
+    _json_cache: Dict[str, Tuple[Any, str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def as_json(self, name: str) -> str:
+        """
+        Return field ``name`` serialized as JSON, or "" when it is empty.
+
+        The encoding is reused until the field is reassigned, so prompts that embed the
+        same style guide, topic or feedback across tasks and attempts encode it once.
+        """
+        value = getattr(self, name)
+        if not value:
+            return ""
+        cached = self._json_cache.get(name)
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        encoded = _dumps(value)
+        self._json_cache[name] = (value, encoded)
+        return encoded
 
 
 class BlogCreationWorkflow:
@@ -55,29 +353,43 @@ class BlogCreationWorkflow:
 
     REVIEW_THRESHOLD = 85
     MAX_RETRIES = 3
+    # Upper bound on agent calls running at once when stages fan out
+    MAX_CONCURRENT_TASKS = 4
+    # Posts embedded in the style prompt are capped in number, per post and in total
+    MAX_POSTS = 5
+    MAX_POST_CHARS = 2000
+    MAX_POSTS_TEXT_CHARS = 12000
+    # Intermediate results are checkpointed here so a retry or re-run resumes instead of restarting
+    CHECKPOINT_DIR = Path(".blog_cache")
+    # Upstream stage results restored from a checkpoint; their tasks are skipped when present
+    CHECKPOINT_FIELDS = ("expertise_profile", "trending_topics", "selected_topic", "style_guide")
+    # The stage graph is fixed: each stage waits for these stages when they run in the same pass
+    STAGE_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {"story": ("profile", "trend"), "craft": ("story", "style")}
+
+    def __init__(self, shared_agents: bool = True) -> None:
+        """
+        Initialize the workflow with all necessary clients and agents.
 
-    def __init__(self) -> None:
-        """Initialize the workflow with all necessary clients and agents."""
-        # Initialize LLM client used specifically by the workflow (e.g., for Perplexity profile fetch)
-        self.perplexity_client = DualModelPerplexityClient(
-            reasoning_model="sonar-pro",
-            concept_model="sonar",
-            default_model="reasoning",
-        )
-        # Create agents by calling their respective functions
+        Args:
+            shared_agents: Use the process-wide agents, so a new workflow instance is cheap.
+                CrewAI agents must not run tasks on two threads at once, so a workflow that
+                runs alongside others passes False to get agents of its own.
+        """
+        # LLM client used specifically by the workflow (e.g., for Perplexity profile fetch)
+        self.perplexity_client = _shared_perplexity_client()
+        self._agents = _shared_agents if shared_agents else lru_cache(maxsize=2)(_create_agents)
         self._initialize_agents()
 
     def _initialize_agents(self) -> None:
-        """Initialize all agents by calling their dedicated creation functions."""
+        """
+        Attach the workflow's agents, creating them on first use (safe to call repeatedly).
+
+        Agents are verbose when debug logging is on at the time of the call; ``run``
+        calls this again so ``debug=True`` takes effect on agents built earlier.
+        """
         try:
-            self.profile_analyst = get_profile_analyst_agent()
-            self.trend_scout = get_trend_scout_agent()
-            self.story_architect = get_story_architect_agent()
-            self.style_decoder = get_style_decoder_agent()
-            self.blog_craftsman = get_blog_craftsman_agent()
-            self.blog_critic = get_blog_critic_agent()
-            self.blog_alchemist = get_blog_alchemist_agent()
-            self.community_connector = get_community_connector_agent()
+            for name, agent in self._agents(logger.isEnabledFor(logging.DEBUG)).items():
+                setattr(self, name, agent)
             logger.info("All agents initialized successfully within the workflow.")
         except Exception as e:
             logger.critical(f"Failed to initialize one or more agents: {e}")
@@ -85,146 +397,233 @@ class BlogCreationWorkflow:
 
     def _parse_json_output(self, raw_output: str) -> Dict[str, Any]:
         """Parse JSON from agent output, handling common formatting issues."""
-        try:
-            cleaned = re.sub(r"```json\s*", "", raw_output)
-            cleaned = re.sub(r"```\s*$", "", cleaned)
-            json_match = re.search(r"\{.*\}", cleaned, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            return json.loads(cleaned)
-        except json.JSONDecodeError as exc:  # pragma: no cover - robustness
-            logger.error("JSON parsing error: %s", exc)
-            logger.debug("Raw output: %s", raw_output)
-            # Attempt to find the first '{' and last '}' to salvage JSON
-            start = cleaned.find('{')
-            end = cleaned.rfind('}')
-            if start != -1 and end != -1 and start < end:
-                try:
-                    return json.loads(cleaned[start:end + 1])
-                except json.JSONDecodeError:
-                    pass  # Failed again, return empty dict
+        return _parse_json(raw_output)
 
-            return {}
+    def _create_tasks(self, project: BlogProject) -> Dict[str, Task]:
+        """
+        Create the tasks for a full pass (profile through draft), keyed by stage name.
 
-    def _create_tasks(self, project: BlogProject) -> List[Task]:
-        """Create all tasks for the blog creation workflow."""
-        tasks = []
+        Tasks are returned in execution order, and each task's ``context`` lists the
+        tasks it waits for: story needs profile and trend, craft needs story and style.
+        Profile analysis, trend scouting and style decoding depend on nothing, so they
+        start together, and style decoding can still be running while the story is built.
 
-        profile_task = Task(
-            description=get_profile_analyst_prompt(profile_data=project.linkedin_profile),
-            expected_output="Expertise profile and story bank in JSON format",
-            agent=self.profile_analyst,
-        )
-        tasks.append(profile_task)
-
-        trend_task = Task(
-            description=get_trend_scout_prompt(
-                expertise_areas=json.dumps(
-                    project.expertise_profile.get("technical_expertise", {})
-                )
-                if project.expertise_profile
-                else "General software development"
-            ),
-            expected_output="Trending topics with engagement scores in JSON format",
-            agent=self.trend_scout,
-            async_execution=True,
-        )
-        tasks.append(trend_task)
-
-        story_task = Task(
-            description=get_story_architect_prompt(
-                selected_topic=json.dumps(project.selected_topic)
-                if project.selected_topic
-                else "",
-                expertise_profile=json.dumps(project.expertise_profile)
-                if project.expertise_profile
-                else "",
-                story_bank=json.dumps(project.expertise_profile.get("career_stories", []))
-                if project.expertise_profile
-                else "",
-            ),
-            expected_output="Story blueprint with narrative arc in JSON format",
-            agent=self.story_architect,
-            context=[profile_task, trend_task],
-        )
-        tasks.append(story_task)
+        Stages whose results are already on the project (from an earlier attempt or
+        a checkpoint) are left out; their data still reaches later prompts. The story and
+        craft prompts are rendered again by ``_execute_stages`` once their dependencies
+        finish, so they carry what this pass produced (such as the selected topic).
+        """
+        from crewai import Task
 
-        style_task = Task(
-            description=get_style_decoder_prompt(
-                linkedin_posts="\n\n---POST---\n\n".join(project.linkedin_posts)
-                if project.linkedin_posts
-                else "No posts available"
-            ),
-            expected_output="Comprehensive style guide in JSON format",
-            agent=self.style_decoder,
-        )
-        tasks.append(style_task)
+        from src.ai_agentic_workflow.agents.profile_analyst_agent import get_profile_analyst_prompt
+        from src.ai_agentic_workflow.agents.style_decoder_agent import get_style_decoder_prompt
+        from src.ai_agentic_workflow.agents.trend_scout_agent import get_trend_scout_prompt
+
+        tasks: Dict[str, Task] = {}
+
+        expertise = project.expertise_profile
+        tech_json = _dumps(expertise.get("technical_expertise", {})) if expertise else ""
+
+        if not project.expertise_profile:
+            tasks["profile"] = Task(
+                description=get_profile_analyst_prompt(profile_data=project.linkedin_profile),
+                expected_output="Expertise profile and story bank in JSON format." + _COMPACT_JSON,
+                agent=self.profile_analyst,
+            )
+
+        if not project.trending_topics:
+            tasks["trend"] = Task(
+                description=get_trend_scout_prompt(
+                    expertise_areas=tech_json or "General software development"
+                ),
+                expected_output="Trending topics with engagement scores in JSON format." + _COMPACT_JSON,
+                agent=self.trend_scout,
+            )
+
+        if not project.style_guide:
+            tasks["style"] = Task(
+                description=get_style_decoder_prompt(
+                    linkedin_posts=project.linkedin_posts_text or "No posts available"
+                ),
+                expected_output="Comprehensive style guide in JSON format." + _COMPACT_JSON,
+                agent=self.style_decoder,
+            )
+
+        if not project.story_blueprint:
+            tasks["story"] = Task(
+                description=self._stage_description(project, "story"),
+                expected_output="Story blueprint with narrative arc in JSON format." + _COMPACT_JSON,
+                agent=self.story_architect,
+                context=self._stage_context(tasks, "story"),
+            )
 
         craft_task = Task(
-            description=get_blog_craftsman_prompt(
-                story_blueprint=json.dumps(project.story_blueprint)
-                if project.story_blueprint
-                else "",
-                style_guide=json.dumps(project.style_guide)
-                if project.style_guide
-                else "",
-                topic_details=json.dumps(project.selected_topic)
-                if project.selected_topic
-                else "",
-            ),
-            expected_output="Complete blog post in markdown format",
+            description=self._stage_description(project, "craft"),
+            expected_output="Complete blog post in markdown format." + _BLOG_LENGTH,
             agent=self.blog_craftsman,
-            context=[story_task, style_task],
+            context=self._stage_context(tasks, "craft"),
+        )
+        tasks["craft"] = craft_task
+
+        return tasks
+
+    def _stage_description(self, project: BlogProject, stage: str) -> str:
+        """Render the prompt of a stage that embeds upstream results ("story" or "craft") from the project as it stands."""
+        if stage == "story":
+            from src.ai_agentic_workflow.agents.story_architect_agent import get_story_architect_prompt
+
+            expertise = project.expertise_profile
+            return get_story_architect_prompt(
+                selected_topic=project.as_json("selected_topic"),
+                expertise_profile=project.as_json("expertise_profile"),
+                story_bank=_dumps(expertise.get("career_stories", [])) if expertise else "",
+            )
+        from src.ai_agentic_workflow.agents.blog_craftsman_agent import get_blog_craftsman_prompt
+
+        return get_blog_craftsman_prompt(
+            story_blueprint=project.as_json("story_blueprint"),
+            style_guide=project.as_json("style_guide"),
+            topic_details=project.as_json("selected_topic"),
         )
-        tasks.append(craft_task)
-
-        review_task = Task(
-            description=get_blog_critic_prompt(
-                blog_content=project.blog_draft if project.blog_draft else "",
-                profile_data=project.linkedin_profile,
-                style_guide=json.dumps(project.style_guide)
-                if project.style_guide
-                else "",
+
+    def _stage_context(self, tasks: Dict[str, Task], stage: str) -> List[Task]:
+        """The already-created tasks ``stage`` depends on; stages skipped in this pass are left out."""
+        return [tasks[name] for name in self.STAGE_DEPENDENCIES[stage] if name in tasks]
+
+    def _create_enhance_task(self, project: BlogProject) -> Task:
+        """
+        Create the alchemist task for the latest blog version.
+
+        The alchemist is seeded with the blog, the style guide and the most recent review
+        feedback as prompt text, so none of the upstream stages are re-run.
+        """
+        from crewai import Task
+
+        from src.ai_agentic_workflow.agents.blog_alchemist_agent import get_blog_alchemist_prompt
+
+        return Task(
+            description=get_blog_alchemist_prompt(
+                blog_content=project.enhanced_blog or project.blog_draft,
+                review_feedback=project.as_json("review_feedback"),
+                style_guide=project.as_json("style_guide"),
             ),
-            expected_output="Detailed review with scores and feedback in JSON format",
-            agent=self.blog_critic,
-            context=[craft_task],
+            expected_output="Enhanced blog post in markdown format." + _BLOG_LENGTH,
+            agent=self.blog_alchemist,
+        )
+
+    def _review_and_enhance(self, project: BlogProject, speculate: bool) -> None:
+        """
+        Review the latest blog version while the alchemist speculatively enhances it.
+
+        Enhancement has no side effects and is needed whenever the review falls short,
+        so it is started alongside the critics instead of after them. It works from the
+        feedback available at that point (none on the first draft). A passing review
+        discards it without waiting; otherwise it becomes the version the next attempt
+        reviews. Updates ``review_feedback``, ``final_score`` and ``enhanced_blog``.
+        """
+        pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            enhance_task = self._create_enhance_task(project) if speculate else None
+            enhanced = pool.submit(self._run_task, enhance_task) if enhance_task is not None else None
+            self._run_review_panel(project)
+            project.final_score = _review_score(project.review_feedback)
+            if enhanced is None or project.final_score >= self.REVIEW_THRESHOLD:
+                return
+            try:
+                enhanced_blog = enhanced.result()
+            except Exception as e:
+                logger.error(f"Speculative enhancement failed: {e}", exc_info=True)
+                return
+            if enhanced_blog:
+                self._remember_output(enhance_task, enhanced_blog)
+                project.enhanced_blog = enhanced_blog
+                logger.debug("Enhanced blog: %s", project.enhanced_blog)
+        finally:
+            # A discarded enhancement finishes in the background instead of holding up the run
+            pool.shutdown(wait=False)
+
+    def _run_review_panel(self, project: BlogProject) -> None:
+        """
+        Scatter the review of the latest blog version to every critic and gather the verdicts.
+
+        Each critic runs on its own worker thread, so the stage takes
+        as long as the slowest critic rather than the sum of all of them. Critics that
+        fail or return no JSON are left out of the aggregate.
+        """
+        from crewai import Task
+
+        from src.ai_agentic_workflow.agents.blog_critic_agent import get_blog_critic_prompt
+
+        description = get_blog_critic_prompt(
+            blog_content=project.enhanced_blog or project.blog_draft or "",
+            profile_data=project.linkedin_profile,
+            style_guide=project.as_json("style_guide"),
         )
-        tasks.append(review_task)
-
-        # Conditional enhancement task
-        if project.review_feedback and project.review_feedback.get("overall_score", 0) < self.REVIEW_THRESHOLD:
-            logger.info("Review score below threshold, adding enhancement task.")
-            enhance_task = Task(
-                description=get_blog_alchemist_prompt(
-                    blog_content=project.blog_draft,
-                    review_feedback=json.dumps(project.review_feedback),
-                    style_guide=json.dumps(project.style_guide)
-                    if project.style_guide
-                    else "",
+        tasks = [
+            Task(
+                description=description,
+                expected_output=(
+                    "Review with scores and feedback in JSON format, each observation, strength "
+                    "and suggestion in one sentence." + _COMPACT_JSON
                 ),
-                expected_output="Enhanced blog post in markdown format",
-                agent=self.blog_alchemist,
-                context=[review_task],
+                agent=critic,
             )
-            tasks.append(enhance_task)
-        else:
-            logger.info("Review score met threshold, skipping enhancement task.")
+            for critic in self.blog_critics
+        ]
+
+        reviews = []
+        with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+            futures = [pool.submit(self._run_task, task) for task in tasks]
+            # Gathered in panel order so the aggregate does not depend on finishing order
+            for task, future in zip(tasks, futures):
+                try:
+                    raw = future.result() or ""
+                    review = self._parse_json_output(raw)
+                except Exception as e:
+                    logger.error(f"Blog critic failed, aggregating without it: {e}", exc_info=True)
+                    continue
+                if review:
+                    self._remember_output(task, raw)
+                    reviews.append(review)
+
+        if not reviews:
+            raise ValueError("No blog critic returned a usable review.")
+        project.review_feedback = _aggregate_reviews(reviews)
+        logger.debug("Review feedback (%s critics): %s", len(reviews), project.review_feedback)
+
+    def _run_task(self, task: Task, context: Optional[str] = None) -> Optional[str]:
+        """
+        Run a single task on its agent and return its raw output.
+
+        Identical calls (same role, model, prompt and context) across stages, retries,
+        critics and workflow runs are answered from the shared task cache instead of the LLM.
+        Nothing is stored here: callers pass outputs they could use to ``_remember_output``,
+        so a malformed reply is asked for again on retry rather than replayed.
+        """
+        raw = _cached_task_output(_task_cache_key(task, context))
+        if raw is not None:
+            logger.debug("Task cache hit for %s", getattr(task.agent, "role", "agent"))
+            return raw
+        return task.agent.execute_task(task, context)
+
+    def _remember_output(self, task: Task, raw: str, context: Optional[str] = None) -> None:
+        """Cache a task's raw output once it has been parsed and accepted."""
+        _cache_task_output(_task_cache_key(task, context), raw)
 
-        community_task = Task(
+    def _create_community_task(self, project: BlogProject) -> Task:
+        """Create the community connector task for the latest blog version."""
+        from crewai import Task
+
+        from src.ai_agentic_workflow.agents.community_connector_agent import get_community_connector_prompt
+
+        return Task(
             description=get_community_connector_prompt(
                 blog_content=project.enhanced_blog or project.blog_draft,
-                topic=json.dumps(project.selected_topic)
-                if project.selected_topic
-                else "",
+                topic=project.as_json("selected_topic"),
             ),
             expected_output="Enhanced blog with resources and community connections",
             agent=self.community_connector,
-            context=tasks[-1:],  # Context should be the last task added, either craft or enhance
         )
-        tasks.append(community_task)
-
-        return tasks
 
     def select_best_topic(
             self, expertise_profile: Dict[str, Any], trending_topics: List[Dict[str, Any]]
@@ -233,15 +632,13 @@ class BlogCreationWorkflow:
         best_topic = None
         best_score = 0
 
-        user_technologies = set(expertise_profile.get("technical_expertise", {}).keys())
+        # Lowercased once, not per topic; nested names ("java" in "javascript") each count
+        user_technologies = [tech.lower() for tech in expertise_profile.get("technical_expertise", {})]
 
         for topic in trending_topics:
             score = topic.get("engagement_score", 0) * 0.5
             topic_text = f"{topic.get('topic', '')} {topic.get('category', '')}".lower()
-            tech_match_score = sum(
-                20 for tech in user_technologies if tech.lower() in topic_text
-            )
-            score += tech_match_score
+            score += sum(20 for tech in user_technologies if tech in topic_text)
             if topic.get("difficulty_level") in ["beginner", "intermediate"]:
                 score += 10
             if topic.get("teaching_potential"):
@@ -256,23 +653,8 @@ class BlogCreationWorkflow:
     def fetch_profile_with_perplexity(self, profile_url: str) -> Tuple[str, List[str]]:
         """Use Perplexity AI to retrieve profile summary and recent posts."""
         try:
-            profile_prompt = (
-                "Summarize the work experience, roles, responsibilities and skills "
-                f"from the LinkedIn profile at {profile_url}."
-            )
-            posts_prompt = (
-                "Provide three representative posts or content snippets from "
-                f"the LinkedIn profile at {profile_url}."
-            )
-            llm = self.perplexity_client.get_llm()
-            logger.debug(f"[Perplexity] Requesting profile summary with prompt: {profile_prompt}")
-            profile_text = llm.invoke(profile_prompt)  # type: ignore[arg-type]
-            logger.debug(f"[Perplexity] Received profile summary: {profile_text}")
-            logger.debug(f"[Perplexity] Requesting posts with prompt: {posts_prompt}")
-            posts_text = llm.invoke(posts_prompt)  # type: ignore[arg-type]
-            logger.debug(f"[Perplexity] Received posts: {posts_text}")
-            posts = re.split(r"\n\n+", str(posts_text)) if posts_text else []
-            return str(profile_text), posts[:10]
+            summary, posts = _fetch_profile(self.perplexity_client, profile_url)
+            return summary, list(posts)
         except Exception as exc:  # pragma: no cover - network issues
             logger.error("Perplexity profile retrieval failed: %s", exc)
             return "", []
@@ -285,126 +667,45 @@ class BlogCreationWorkflow:
     ) -> BlogProject:
         """Run the complete blog creation workflow."""
 
+        if debug:
+            logging.getLogger().setLevel(logging.DEBUG)
+            logger.debug("Debug logging enabled")
+        self._initialize_agents()
+
         project = BlogProject(linkedin_profile=linkedin_profile_data or linkedin_profile_url)
 
         if linkedin_profile_data is None and linkedin_profile_url:
             summary, posts = self.fetch_profile_with_perplexity(linkedin_profile_url)
             project.linkedin_posts = posts
-            logger.debug(f"LinkedIn profile summary: {summary}")
-            logger.debug(f"LinkedIn posts: {posts}")
+            project.linkedin_posts_text = "\n\n---POST---\n\n".join(
+                post[:self.MAX_POST_CHARS] for post in posts[:self.MAX_POSTS]
+            )[:self.MAX_POSTS_TEXT_CHARS]
+            logger.debug("LinkedIn profile summary: %s", summary)
+            logger.debug("LinkedIn posts: %s", posts)
 
-        if debug:
-            logging.getLogger().setLevel(logging.DEBUG)
-            logger.debug("Debug logging enabled")
+        self._load_checkpoint(project)
 
         for attempt in range(1, self.MAX_RETRIES + 1):
             project.attempts = attempt
-            logger.info("Starting blog creation attempt %s", attempt)
             try:
-                tasks = self._create_tasks(project)
-                # Ensure all agents are available before creating the crew
-                all_agents = [
-                    self.profile_analyst,
-                    self.trend_scout,
-                    self.story_architect,
-                    self.style_decoder,
-                    self.blog_craftsman,
-                    self.blog_critic,
-                    self.blog_alchemist,
-                    self.community_connector,
-                ]
-                # Filter out None agents if any initialization failed (though it should raise an exception)
-                available_agents = [agent for agent in all_agents if agent is not None]
-
-                if not available_agents:
-                    logger.error("No agents available to run the crew. Exiting.")
-                    raise ValueError("No agents initialized for the workflow.")
-
-                logger.debug(f"Created tasks: {[t.description for t in tasks]}")
-                crew = Crew(
-                    agents=available_agents,
-                    tasks=tasks,
-                    process=Process.sequential,
-                    verbose=debug,
-                )
-
-                logger.debug("Kicking off CrewAI workflow...")
-                result = crew.kickoff()
-                outputs = result.tasks_output
-                logger.debug(f"CrewAI raw outputs: {[o.raw for o in outputs]}")
-
-                # Process outputs
-                # Note: The indices here assume a fixed order of task execution and output
-                # based on the _create_tasks method. Careful debugging is needed if tasks change.
-                if len(outputs) > 0:
-                    project.expertise_profile = self._parse_json_output(outputs[0].raw)
-                    logger.debug(f"Expertise profile: {project.expertise_profile}")
-                if len(outputs) > 1:
-                    project.trending_topics = self._parse_json_output(outputs[1].raw).get("trending_topics", [])
-                    logger.debug(f"Trending topics: {project.trending_topics}")
-
-                if not project.selected_topic and project.trending_topics:
-                    project.selected_topic = self.select_best_topic(
-                        project.expertise_profile, project.trending_topics
-                    )
-                    logger.debug(f"Selected topic: {project.selected_topic}")
-
-                if len(outputs) > 2:
-                    project.story_blueprint = self._parse_json_output(outputs[2].raw)
-                    logger.debug(f"Story blueprint: {project.story_blueprint}")
-                if len(outputs) > 3:
-                    project.style_guide = self._parse_json_output(outputs[3].raw)
-                    logger.debug(f"Style guide: {project.style_guide}")
-                if len(outputs) > 4:
-                    project.blog_draft = outputs[4].raw
-                    logger.debug(f"Blog draft: {project.blog_draft}")
-                if len(outputs) > 5:
-                    project.review_feedback = self._parse_json_output(outputs[5].raw)
-                    logger.debug(f"Review feedback: {project.review_feedback}")
-
-                current_score = project.review_feedback.get("overall_score", 0) if project.review_feedback else 0
-                project.final_score = current_score
-
-                # Determine which output contains the final blog based on review score
-                # And handle community resources extraction
-                if current_score < self.REVIEW_THRESHOLD:
-                    if len(outputs) > 6:
-                        project.enhanced_blog = outputs[6].raw
-                        logger.debug(f"Enhanced blog: {project.enhanced_blog}")
-                        # If enhancement happened, the next output is the final blog (enhanced + community)
-                        if len(outputs) > 7:
-                            # The community connector agent returns markdown + JSON, so we split
-                            full_output = outputs[7].raw
-                            blog_part, json_part = self._split_markdown_json_output(full_output)
-                            project.final_blog = blog_part
-                            project.community_resources = self._parse_json_output(json_part)
-                            logger.debug(f"Final blog (after enhancement + community): {project.final_blog}")
-                            logger.debug(f"Community resources: {project.community_resources}")
-                        else:
-                            logger.warning(
-                                "Community resources task output not found after enhancement. Falling back to enhanced blog as final.")
-                            project.final_blog = project.enhanced_blog  # Fallback if community task output is missing
-                    else:
-                        logger.warning(
-                            "Enhancement expected but corresponding output not found. Falling back to blog draft as final.")
-                        project.final_blog = project.blog_draft  # Fallback to draft if enhancement failed
+                if project.blog_draft:
+                    # Only the draft fell short, so review the enhanced version rather than rebuilding it
+                    logger.info("Starting refinement attempt %s (score %s)", attempt, project.final_score)
                 else:
-                    if len(outputs) > 6:  # If no enhancement, the 6th output is community-enhanced blog
-                        full_output = outputs[6].raw
-                        blog_part, json_part = self._split_markdown_json_output(full_output)
-                        project.final_blog = blog_part
-                        project.community_resources = self._parse_json_output(json_part)
-                        logger.debug(f"Final blog (no enhancement + community): {project.final_blog}")
-                        logger.debug(f"Community resources: {project.community_resources}")
-                    else:
-                        logger.warning(
-                            "Final blog or community resources output missing when review met threshold. Falling back to blog draft.")
-                        project.final_blog = project.blog_draft
+                    logger.info("Starting blog creation attempt %s", attempt)
+                    # A profile and trends restored from a checkpoint yield the topic before any stage runs
+                    self._select_topic(project)
+                    self._run_stages(project, self._create_tasks(project))
+
+                # No enhancement is worth speculating on when no review would follow it
+                self._review_and_enhance(project, speculate=attempt < self.MAX_RETRIES)
+                self._save_checkpoint(project)
 
                 if project.final_score >= self.REVIEW_THRESHOLD:
                     logger.info(
                         "Blog created successfully with score %s", project.final_score
                     )
+                    self._checkpoint_path(project).unlink(missing_ok=True)
                     break
             except Exception as exc:  # Catching broad exceptions for retry logic
                 logger.error("Error in blog creation attempt %s: %s", attempt, exc, exc_info=True)
@@ -413,36 +714,239 @@ class BlogCreationWorkflow:
                     raise  # Re-raise if all retries fail
                 else:
                     logger.info("Retrying workflow...")
-                    # Reset relevant project states for retry if needed, or let the next iteration handle it
+
+        # Resources are added once, to the version that came out of the review loop
+        try:
+            community_task = self._create_community_task(project)
+            community_output = self._run_task(community_task)
+            if community_output and self._on_stage_output(project, "community", community_output):
+                self._remember_output(community_task, community_output)
+        except Exception as exc:
+            logger.error("Community resources task failed: %s", exc, exc_info=True)
+        if project.final_blog is None:
+            logger.warning(
+                "Community resources task output not found. Falling back to the latest blog version as final.")
+            project.final_blog = project.enhanced_blog or project.blog_draft
 
         return project
 
+    def _run_stages(self, project: BlogProject, tasks: Dict[str, Task]) -> None:
+        """Run ``tasks`` as a dependency graph, parsing each stage into ``project`` as it completes."""
+        if any(task.agent is None for task in tasks.values()):
+            logger.error("No agents available to run the tasks. Exiting.")
+            raise ValueError("No agents initialized for the workflow.")
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Created tasks: %s", [t.description for t in tasks.values()])
+        asyncio.run(self._execute_stages(project, tasks))
+
+    async def _execute_stages(self, project: BlogProject, tasks: Dict[str, Task]) -> None:
+        """
+        Start every task as soon as the tasks in its ``context`` have finished.
+
+        This replaces CrewAI's sequential process, which waits for every earlier task: here
+        a run takes as long as its longest dependency chain. Agents are blocking, so each
+        call runs on a worker thread, with at most MAX_CONCURRENT_TASKS in flight. The
+        first failure propagates, failing the attempt.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_TASKS)
+        running: Dict[int, asyncio.Task] = {}
+
+        async def run_stage(stage: str, task: Task) -> str:
+            context = [await running[id(dependency)] for dependency in task.context or []]
+            if stage in self.STAGE_DEPENDENCIES:
+                # Rendered now, so the prompt embeds what its dependencies just produced
+                task.description = self._stage_description(project, stage)
+            joined_context = _CONTEXT_DIVIDER.join(context) or None
+            async with semaphore:
+                raw = await asyncio.to_thread(self._run_task, task, joined_context) or ""
+            # Parsed right away, overlapping with the stages still waiting on the LLM; large
+            # outputs are parsed on a worker thread so the other stages are not held up
+            if len(raw) > _JSON_OFFLOAD_BYTES:
+                usable = await asyncio.to_thread(self._on_stage_output, project, stage, raw)
+            else:
+                usable = self._on_stage_output(project, stage, raw)
+            if usable:
+                self._remember_output(task, raw, joined_context)
+            return raw
+
+        # Tasks come in execution order, so every dependency is scheduled before its dependents
+        for stage, task in tasks.items():
+            running[id(task)] = asyncio.create_task(run_stage(stage, task))
+        await asyncio.gather(*running.values())
+
+    def _select_topic(self, project: BlogProject) -> None:
+        """Pick the topic as soon as both the expertise profile and the trending topics are in."""
+        if project.selected_topic or not project.trending_topics or not project.expertise_profile:
+            return
+        project.selected_topic = self.select_best_topic(project.expertise_profile, project.trending_topics)
+        logger.debug("Selected topic: %s", project.selected_topic)
+
+    def _on_stage_output(self, project: BlogProject, stage: str, raw: str) -> bool:
+        """
+        Parse one stage's raw output into the project (called as each task completes).
+
+        Returns:
+            True if the output was usable (it parsed to something non-empty), so it may be cached.
+        """
+        logger.debug("Raw output for %s: %s", stage, raw)
+        if stage == "profile":
+            project.expertise_profile = self._parse_json_output(raw)
+            logger.debug("Expertise profile: %s", project.expertise_profile)
+            if not project.expertise_profile:
+                # Every later stage builds on the profile, so fail the attempt now, not after the draft
+                raise ValueError("Profile analysis returned no usable JSON.")
+            self._select_topic(project)
+            return True
+        elif stage == "trend":
+            project.trending_topics = self._parse_json_output(raw).get("trending_topics", [])
+            logger.debug("Trending topics: %s", project.trending_topics)
+            self._select_topic(project)
+            return bool(project.trending_topics)
+        elif stage == "story":
+            project.story_blueprint = self._parse_json_output(raw)
+            logger.debug("Story blueprint: %s", project.story_blueprint)
+            return bool(project.story_blueprint)
+        elif stage == "style":
+            project.style_guide = self._parse_json_output(raw)
+            logger.debug("Style guide: %s", project.style_guide)
+            return bool(project.style_guide)
+        elif stage == "craft":
+            project.blog_draft = raw
+            logger.debug("Blog draft: %s", project.blog_draft)
+            return bool(raw)
+        elif stage == "community":
+            # The community connector agent returns markdown + JSON, so we split
+            blog_part, json_part = self._split_markdown_json_output(raw)
+            project.final_blog = blog_part
+            project.community_resources = self._parse_json_output(json_part)
+            logger.debug("Final blog (with community resources): %s", project.final_blog)
+            logger.debug("Community resources: %s", project.community_resources)
+            return bool(project.final_blog)
+        return False
+
+    def _checkpoint_path(self, project: BlogProject) -> Path:
+        """Return the checkpoint file for a profile (stable across processes, unlike ``hash``)."""
+        digest = hashlib.sha256((project.linkedin_profile or "").encode("utf-8")).hexdigest()[:16]
+        return self.CHECKPOINT_DIR / f"{digest}.json"
+
+    def _save_checkpoint(self, project: BlogProject) -> None:
+        """Persist the project state after an attempt; failures only cost the resume."""
+        path = self._checkpoint_path(project)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            state = {f.name: getattr(project, f.name) for f in fields(project) if f.init}
+            path.write_text(_dumps(state), encoding="utf-8")
+        except (OSError, TypeError) as exc:
+            logger.warning("Could not write blog checkpoint %s: %s", path, exc)
+
+    def _load_checkpoint(self, project: BlogProject) -> None:
+        """Restore completed upstream stages from an earlier, unfinished run of the same profile."""
+        path = self._checkpoint_path(project)
+        if not path.exists():
+            return
+        try:
+            saved = _loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Ignoring unreadable blog checkpoint %s: %s", path, exc)
+            return
+        restored = [name for name in self.CHECKPOINT_FIELDS if saved.get(name)]
+        for name in restored:
+            setattr(project, name, saved[name])
+        logger.info("Resumed from checkpoint %s (stages: %s)", path, ", ".join(restored) or "none")
+
     def _split_markdown_json_output(self, raw_output: str) -> Tuple[str, str]:
         """
         Splits the raw output from Community Connector Agent into markdown and JSON parts.
         Assumes markdown is first, followed by a JSON block.
         """
-        json_match = re.search(r"(\{.*\})", raw_output, re.DOTALL)
-        if json_match:
-            json_part = json_match.group(1)
-            markdown_part = raw_output[:json_match.start()].strip()
+        if "{" not in raw_output:
+            return raw_output, "{}"
+        span = _json_object_span(raw_output)
+        if span:
+            json_part = raw_output[span[0]:span[1]]
+            markdown_part = raw_output[:span[0]].strip()
             return markdown_part, json_part
         return raw_output, "{}"  # Return original if no JSON, or empty JSON
 
 
+# Workflow instances hold no per-run state, so the convenience function reuses one
+@lru_cache(maxsize=1)
+def _workflow() -> BlogCreationWorkflow:
+    return BlogCreationWorkflow()
+
+
+_worker_state = threading.local()
+
+
+def _worker_workflow() -> BlogCreationWorkflow:
+    """This thread's own workflow and agents, created on its first run."""
+    workflow = getattr(_worker_state, "workflow", None)
+    if workflow is None:
+        workflow = _worker_state.workflow = BlogCreationWorkflow(shared_agents=False)
+    return workflow
+
+
+def _run_in_worker(url: str) -> BlogProject:
+    return _worker_workflow().run(linkedin_profile_url=url)
+
+
 def run_blog_creation_workflow(
         linkedin_profile_data: Optional[str] = None,
         linkedin_profile_url: Optional[str] = None,
         debug: bool = False,
 ) -> Dict[str, Any]:
     """Convenience function to run the blog creation workflow."""
-    workflow = BlogCreationWorkflow()
-    project = workflow.run(
+    from src.ai_agentic_workflow.agents.profile_analyst_agent import user_profile_analysis
+
+    project = _workflow().run(
         linkedin_profile_data=user_profile_analysis,
         linkedin_profile_url=linkedin_profile_url,
         debug=debug,
     )
+    return _project_result(project)
+
+
+def run_many(
+        profile_urls: List[str],
+        max_workers: int = 4,
+        on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Create blogs for several LinkedIn profiles in parallel.
+
+    Each profile runs the full workflow on a worker thread with its own workflow and
+    agents, since CrewAI agents cannot run tasks on two threads at once; ``max_workers``
+    should stay within the LLM providers' rate limits. ``on_result`` is
+    called with each URL and its result as soon as that profile finishes. A profile
+    that fails yields ``{"error": ...}`` instead of stopping the others.
+
+    Returns:
+        Results in the same order as ``profile_urls``.
+    """
+    results: List[Dict[str, Any]] = [{} for _ in profile_urls]
+    if not profile_urls:
+        return results
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(profile_urls))) as pool:
+        futures = {
+            pool.submit(_run_in_worker, url): index
+            for index, url in enumerate(profile_urls)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = _project_result(future.result())
+            except Exception as exc:
+                logger.error("Blog creation failed for %s: %s", profile_urls[index], exc)
+                results[index] = {"error": str(exc)}
+            if on_result is not None:
+                on_result(profile_urls[index], results[index])
+    return results
+
 
+def _project_result(project: BlogProject) -> Dict[str, Any]:
+    """The workflow's results as the plain dict returned to callers."""
     return {
         "expertise_profile": project.expertise_profile,
         "trending_topics": project.trending_topics,
@@ -459,6 +963,7 @@ def run_blog_creation_workflow(
 
 
 if __name__ == "__main__":  # pragma: no cover - manual test
+    setup_logging()
 
     # Example usage: Replace with your actual LinkedIn profile data or URL
     # For a real run, you'd populate linkedin_profile_data or linkedin_profile_url
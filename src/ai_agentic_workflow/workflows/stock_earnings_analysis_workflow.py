@@ -1,12 +1,31 @@
+import asyncio
 import json
 import logging
-from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Dict, Tuple
 
 from langchain_core.prompts import PromptTemplate
 
 from src.ai_agentic_workflow.clients.chatgpt_client import DualModelChatClient
 from src.ai_agentic_workflow.clients.perplexity_client import DualModelPerplexityClient
+from src.ai_agentic_workflow.workflows._stock_common import (
+    ANALYSIS_MAX_TOKENS,
+    API_CONCURRENCY,
+    PREDICTION_MAX_TOKENS,
+    SCREEN_BASE_TOKENS,
+    SCREEN_TOKENS_PER_ITEM,
+    SELECTION_MAX_TOKENS,
+    StockPick,
+    bounded_llm,
+    cache_result,
+    cached_result,
+    extract_json_from_text,
+    format_earnings_query_prompt,
+    format_perplexity_bull_prompt,
+    format_prediction_prompt,
+    format_top2_selection_prompt,
+    stream_json,
+)
 from src.ai_agentic_workflow.automation.open_browser import (
     Site,
     start_persistent_browser,
@@ -16,82 +35,75 @@ from src.ai_agentic_workflow.automation.open_browser import (
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
-class StockPick:
-    symbol: str
-    name: str | None = None
-    market_cap_category: str | None = None  # mid, large
-
-
-def _safe_json_loads(text: str) -> dict | list | None:
-    try:
-        return json.loads(text)
-    except Exception:
-        return None
-
-
-def _extract_json_from_text(text: str) -> dict | list | None:
-    if not text:
-        return None
-    # Try to find a fenced code block with json
-    import re
-    match = re.search(r"```json\s*(\{[\s\S]*?\}|\[[\s\S]*?\])\s*```", text)
-    if match:
-        return _safe_json_loads(match.group(1))
-    # Fallback: first {...} or [...]
-    match = re.search(r"(\{[\s\S]*\}|\[[\s\S]*\])", text)
-    if match:
-        return _safe_json_loads(match.group(1))
-    return _safe_json_loads(text)
-
-
-def _format_earnings_query_prompt(weeks: int = 3) -> str:
-    return (
-        "You are a financial research assistant. Return ONLY valid JSON. "
-        "Task: List publicly-traded US stocks with upcoming earnings in the next "
-        f"{weeks} weeks. Include symbol, company_name, earnings_date (YYYY-MM-DD), and market_cap_category (mid or large). "
-        "Return a JSON array of at most 50 items with keys: symbol, company_name, earnings_date, market_cap_category."
-    )
+# Symbols analysed per Perplexity prompt; larger batches answer slower and less reliably
+BULL_BATCH_SIZE = 5
 
 
-def _format_perplexity_bull_prompt(symbol: str, custom_prompt: str | None) -> str:
+def _format_perplexity_bull_prompt_batch(symbols: List[str], custom_prompt: str | None) -> str:
+    """One prompt analysing every symbol in ``symbols``, so the instructions are sent once per batch."""
     base = (
-        f"Perform a concise bullish-vs-bearish scenario analysis for {symbol}. "
+        f"Perform a concise bullish-vs-bearish scenario analysis for each of these stocks: {', '.join(symbols)}. "
         "Focus on fundamentals, recent earnings trends, guidance, catalysts, risks. "
-        "Return ONLY JSON with keys: symbol, bullish_thesis, key_catalysts, target_price, target_horizon_days, bullish_probability, notes."
+        "Return ONLY JSON of the form {\"analyses\": [...]} with one object per stock, each with keys: "
+        "symbol, bullish_thesis, key_catalysts, target_price, target_horizon_days, bullish_probability, notes."
     )
     if custom_prompt:
         base += "\nAdditional instructions: " + custom_prompt
     return base
 
 
-def _format_top2_selection_prompt(perplexity_json_payloads: List[dict]) -> str:
-    return (
-        "You are screening stocks for near-term bullish potential. You will receive JSON analyses (one per stock).\n"
-        "Pick the two strongest bullish candidates using catalysts, probability, and upside.\n"
-        "Return ONLY JSON with this schema: {\"picks\":[{\"symbol\":str,\"reason\":str}],\"ranking\":[{\"symbol\":str,\"score\":number}]}.\n"
-        f"Analyses: {json.dumps(perplexity_json_payloads)[:12000]}"
-    )
+def _split_batch_analyses(payload: dict | list | None, symbols: List[str]) -> Dict[str, dict]:
+    """Map each analysis in a batch reply back to its symbol; symbols without one are left out."""
+    items = payload.get("analyses") if isinstance(payload, dict) else payload
+    wanted = set(symbols)
+    analyses: Dict[str, dict] = {}
+    for item in items or []:
+        if isinstance(item, dict):
+            symbol = str(item.get("symbol") or "").strip().upper()
+            if symbol in wanted:
+                analyses[symbol] = item
+    return analyses
 
 
-def _format_prediction_prompt(symbol: str) -> str:
-    return (
-        f"For {symbol}, predict a 30-day price target and percentage growth with probability bands.\n"
-        "Return ONLY JSON: {symbol, base_case_target, upside_target, downside_target, base_prob, upside_prob, downside_prob, assumptions}."
-    )
+async def _ainvoke_json_many(
+    calls: Dict[Any, Tuple[Any, str]], limit: int = API_CONCURRENCY
+) -> Dict[Any, dict | list]:
+    """
+    Send each ``(llm, prompt)`` in ``calls`` concurrently and parse the JSON replies.
+
+    At most ``limit`` requests are in flight at once. A call that fails is logged and
+    yields ``{}``, so one symbol's error does not sink the others.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def invoke(llm, prompt: str) -> dict | list:
+        async with semaphore:
+            resp = await llm.ainvoke(prompt)
+        return extract_json_from_text(getattr(resp, "content", str(resp)) or "") or {}
+
+    keys = list(calls)
+    replies = await asyncio.gather(*(invoke(*calls[key]) for key in keys), return_exceptions=True)
+    parsed: Dict[Any, dict | list] = {}
+    for key, reply in zip(keys, replies):
+        if isinstance(reply, Exception):
+            logger.warning("API call for %s failed: %s", key, reply)
+            reply = {}
+        parsed[key] = reply
+    return parsed
 
 
 def run_stock_earnings_analysis(
     earnings_weeks: int = 3,
     desired_count: int = 10,
     custom_bull_prompt: str | None = None,
+    bull_batch_size: int = BULL_BATCH_SIZE,
 ) -> Dict[str, object]:
     """
     End-to-end workflow:
       1) Use ChatGPT to list stocks with earnings in next N weeks
       2) Filter to mid/large cap, top ~desired_count
-      3) For each, open Perplexity in browser and get bullish/bearish JSON, keep only bullish
+      3) Open Perplexity in browser and get bullish/bearish JSON for ``bull_batch_size``
+         stocks per prompt, keep only bullish
       4) Send all analyses to ChatGPT to pick top 2
       5) For each top 2, query both ChatGPT and Perplexity (browser) for price predictions
     """
@@ -105,44 +117,67 @@ def run_stock_earnings_analysis(
     chat = DualModelChatClient()
     pplx_api = DualModelPerplexityClient()
 
-    # Start persistent browser once
+    # Step 1: Earnings list via ChatGPT (API). Replies are cached for the process
+    # (see _stock_common), so reruns within the TTL skip calls already answered
+    earnings_prompt = format_earnings_query_prompt(earnings_weeks, desired_count)
+    earnings_json = cached_result("earnings", earnings_prompt)
+    if earnings_json is None:
+        screen_max_tokens = SCREEN_BASE_TOKENS + desired_count * SCREEN_TOKENS_PER_ITEM
+        screen_llm = bounded_llm(chat.get_llm("reasoning"), screen_max_tokens)
+        earnings_json = stream_json(screen_llm, earnings_prompt) or []
+        cache_result("earnings", earnings_prompt, earnings_json)
+
+    # Normalize and filter; the screener is asked for mid/large caps only, so this is a safety net
+    picks: List[StockPick] = []
+    for item in earnings_json:
+        symbol = (item.get("symbol") or "").strip().upper()
+        name = item.get("company_name")
+        cap = (item.get("market_cap_category") or "").strip().lower()
+        if not symbol:
+            continue
+        if cap not in {"mid", "large"}:
+            continue
+        picks.append(StockPick(symbol=symbol, name=name, market_cap_category=cap))
+    picks = picks[:desired_count]
+    results["earnings_list"] = [p.__dict__ for p in picks]
+
+    if not picks:
+        results["error"] = "No mid/large cap candidates found from the earnings screener."
+        return results
+
+    # Start persistent browser once, only now that there is something to analyse
     driver = start_persistent_browser()
     try:
-        # Step 1: Earnings list via ChatGPT (API)
-        earnings_prompt = _format_earnings_query_prompt(earnings_weeks)
-        earnings_resp = chat.get_llm("reasoning").invoke(earnings_prompt)
-        earnings_json = _extract_json_from_text(getattr(earnings_resp, "content", str(earnings_resp))) or []
-
-        # Normalize and filter
-        picks: List[StockPick] = []
-        for item in earnings_json:
-            symbol = (item.get("symbol") or "").strip().upper()
-            name = item.get("company_name")
-            cap = (item.get("market_cap_category") or "").strip().lower()
-            if not symbol:
-                continue
-            if cap not in {"mid", "large"}:
-                continue
-            picks.append(StockPick(symbol=symbol, name=name, market_cap_category=cap))
-        picks = picks[:desired_count]
-        results["earnings_list"] = [p.__dict__ for p in picks]
-
-        # Step 2: Perplexity analyses via browser
-        pplx_payloads: Dict[str, dict] = {}
-        for p in picks:
-            q = _format_perplexity_bull_prompt(p.symbol, custom_bull_prompt)
+        # Step 2: Perplexity analyses via browser (one tab, so serial), a batch of symbols per
+        # prompt; symbols the browser fails on are retried one by one through the API afterwards
+        pplx_llm = bounded_llm(pplx_api.get_llm("reasoning"), ANALYSIS_MAX_TOKENS)
+        bull_prompts = {p.symbol: format_perplexity_bull_prompt(p.symbol, custom_bull_prompt) for p in picks}
+        analyses: Dict[str, dict | list] = {}
+        for symbol, bull_prompt in bull_prompts.items():
+            cached = cached_result(symbol, bull_prompt)
+            if cached is not None:
+                analyses[symbol] = cached
+        fallbacks: Dict[str, Tuple[Any, str]] = {}
+        symbols = [symbol for symbol in bull_prompts if symbol not in analyses]
+        for start in range(0, len(symbols), max(1, bull_batch_size)):
+            batch = symbols[start:start + max(1, bull_batch_size)]
+            q = _format_perplexity_bull_prompt_batch(batch, custom_bull_prompt)
             try:
                 _, text = run_prompt_in_existing_tab(driver, Site.PERPLEXITY, q, 45)
-                analysis = _extract_json_from_text(text or "") or {}
-                if not analysis:
-                    # Fallback to API call if browser failed
-                    api_text = pplx_api.get_llm("reasoning").invoke(q)
-                    analysis = _extract_json_from_text(getattr(api_text, "content", str(api_text)) or "") or {}
+                analyses.update(_split_batch_analyses(extract_json_from_text(text or ""), batch))
             except Exception as e:
-                logger.warning("Perplexity browser error for %s: %s. Falling back to API.", p.symbol, e)
-                api_text = pplx_api.get_llm("reasoning").invoke(q)
-                analysis = _extract_json_from_text(getattr(api_text, "content", str(api_text)) or "") or {}
+                logger.warning("Perplexity browser error for %s: %s. Falling back to API.", ", ".join(batch), e)
+            for symbol in batch:
+                if not analyses.get(symbol):
+                    fallbacks[symbol] = (pplx_llm, bull_prompts[symbol])
+        if fallbacks:
+            analyses.update(asyncio.run(_ainvoke_json_many(fallbacks)))
+        for symbol in symbols:
+            cache_result(symbol, bull_prompts[symbol], analyses.get(symbol))
 
+        pplx_payloads: Dict[str, dict] = {}
+        for p in picks:
+            analysis = analyses[p.symbol]
             if isinstance(analysis, dict):
                 # Only include if probability is numeric and >= 0.5
                 prob = analysis.get("bullish_probability")
@@ -154,34 +189,62 @@ def run_stock_earnings_analysis(
             results["error"] = "No bullish candidates found from Perplexity analyses."
             return results
 
-        # Step 3: Select top 2 via ChatGPT
-        selection_prompt = _format_top2_selection_prompt(list(pplx_payloads.values()))
-        selection_resp = chat.get_llm("reasoning").invoke(selection_prompt)
-        selection = _extract_json_from_text(getattr(selection_resp, "content", str(selection_resp))) or {}
-        top2 = [item.get("symbol") for item in (selection.get("picks") or []) if item.get("symbol")]
-        top2 = top2[:2]
+        # Step 3: Select top 2 via ChatGPT; with two candidates or fewer there is nothing to rank
+        if len(pplx_payloads) <= 2:
+            top2 = list(pplx_payloads)
+        else:
+            selection_prompt = format_top2_selection_prompt(list(pplx_payloads.values()))
+            selection = stream_json(
+                bounded_llm(chat.get_llm("reasoning"), SELECTION_MAX_TOKENS), selection_prompt
+            ) or {}
+            top2 = [item.get("symbol") for item in (selection.get("picks") or []) if item.get("symbol")]
+            top2 = top2[:2]
         results["top2"] = top2
 
-        # Step 4: Predictions via both ChatGPT (API) and Perplexity (browser)
-        predictions: Dict[str, Dict[str, object]] = {}
-        for sym in top2:
-            pred_prompt = _format_prediction_prompt(sym)
-            # ChatGPT
-            gpt_resp = chat.get_llm("reasoning").invoke(pred_prompt)
-            gpt_json = _extract_json_from_text(getattr(gpt_resp, "content", str(gpt_resp))) or {}
-            # Perplexity via browser, fallback to API
-            try:
-                _, p_text = run_prompt_in_existing_tab(driver, Site.PERPLEXITY, pred_prompt, 45)
-                pplx_json = _extract_json_from_text(p_text or "") or {}
-                if not pplx_json:
-                    p_api = pplx_api.get_llm("reasoning").invoke(pred_prompt)
-                    pplx_json = _extract_json_from_text(getattr(p_api, "content", str(p_api)) or "") or {}
-            except Exception:
-                p_api = pplx_api.get_llm("reasoning").invoke(pred_prompt)
-                pplx_json = _extract_json_from_text(getattr(p_api, "content", str(p_api)) or "") or {}
-
-            predictions[sym] = {"chatgpt": gpt_json, "perplexity": pplx_json}
-        results["predictions"] = predictions
+        # Step 4: Predictions via both ChatGPT (API) and Perplexity (browser). The ChatGPT
+        # calls run on a worker thread while the browser (main thread only) is driven; any
+        # Perplexity API fallbacks go out together once the browser is done
+        pred_prompts = {sym: format_prediction_prompt(sym) for sym in top2}
+        gpt_pred_llm = bounded_llm(chat.get_llm("reasoning"), PREDICTION_MAX_TOKENS)
+        pplx_pred_llm = bounded_llm(pplx_api.get_llm("reasoning"), PREDICTION_MAX_TOKENS)
+        gpt_preds: Dict[str, dict | list] = {}
+        pplx_preds: Dict[str, dict | list] = {}
+        for sym, pred_prompt in pred_prompts.items():
+            for source, preds in (("chatgpt", gpt_preds), ("perplexity", pplx_preds)):
+                cached = cached_result(f"{source}:{sym}", pred_prompt)
+                if cached is not None:
+                    preds[sym] = cached
+        fresh_pplx = [sym for sym in pred_prompts if sym not in pplx_preds]
+        fallbacks: Dict[str, Tuple[Any, str]] = {}
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            gpt_future = pool.submit(
+                asyncio.run,
+                _ainvoke_json_many(
+                    {sym: (gpt_pred_llm, pred_prompt) for sym, pred_prompt in pred_prompts.items() if sym not in gpt_preds}
+                ),
+            )
+            for sym in fresh_pplx:
+                pred_prompt = pred_prompts[sym]
+                try:
+                    _, p_text = run_prompt_in_existing_tab(driver, Site.PERPLEXITY, pred_prompt, 45)
+                    pplx_preds[sym] = extract_json_from_text(p_text or "") or {}
+                except Exception:
+                    pass
+                if not pplx_preds.get(sym):
+                    fallbacks[sym] = (pplx_pred_llm, pred_prompt)
+            if fallbacks:
+                pplx_preds.update(asyncio.run(_ainvoke_json_many(fallbacks)))
+            fresh_gpt_preds = gpt_future.result()
+        gpt_preds.update(fresh_gpt_preds)
+        for sym, pred_prompt in pred_prompts.items():
+            if sym in fresh_gpt_preds:
+                cache_result(f"chatgpt:{sym}", pred_prompt, gpt_preds[sym])
+            if sym in fresh_pplx:
+                cache_result(f"perplexity:{sym}", pred_prompt, pplx_preds.get(sym))
+
+        results["predictions"] = {
+            sym: {"chatgpt": gpt_preds[sym], "perplexity": pplx_preds.get(sym) or {}} for sym in top2
+        }
         return results
 
     finally:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any, Dict, List
 
@@ -9,6 +10,19 @@ from crewai import Agent, Task, Crew, Process
 
 from src.ai_agentic_workflow.clients.chatgpt_client import DualModelChatClient
 from src.ai_agentic_workflow.clients.perplexity_client import DualModelPerplexityClient
+from src.ai_agentic_workflow.workflows._stock_common import (
+    ANALYSIS_MAX_TOKENS,
+    API_CONCURRENCY,
+    PREDICTION_MAX_TOKENS,
+    bounded_llm,
+    cache_result,
+    cached_result,
+    extract_json_from_text,
+    format_earnings_query_prompt,
+    format_perplexity_bull_prompt,
+    format_prediction_prompt,
+    format_top2_selection_prompt,
+)
 from src.ai_agentic_workflow.automation.open_browser import (
     Site,
     start_persistent_browser,
@@ -19,62 +33,18 @@ from src.ai_agentic_workflow.automation.open_browser import (
 logger = logging.getLogger(__name__)
 
 
-def _extract_json_from_text(text: str) -> dict | list | None:
-    import re
-    if not text:
-        return None
-    match = re.search(r"```json\s*(\{[\s\S]*?\}|\[[\s\S]*?\])\s*```", text)
-    if match:
-        try:
-            return json.loads(match.group(1))
-        except Exception:
-            pass
-    match = re.search(r"(\{[\s\S]*\}|\[[\s\S]*\])", text)
-    if match:
-        try:
-            return json.loads(match.group(1))
-        except Exception:
-            pass
-    try:
-        return json.loads(text)
-    except Exception:
-        return None
-
-
-def _format_earnings_query_prompt(weeks: int = 3) -> str:
-    return (
-        "You are a financial research assistant. Return ONLY valid JSON. "
-        "Task: List publicly-traded US stocks with upcoming earnings in the next "
-        f"{weeks} weeks. Include symbol, company_name, earnings_date (YYYY-MM-DD), and market_cap_category (mid or large). "
-        "Return a JSON array of at most 50 items with keys: symbol, company_name, earnings_date, market_cap_category."
-    )
-
-
-def _format_perplexity_bull_prompt(symbol: str, custom_prompt: str | None) -> str:
-    base = (
-        f"Perform a concise bullish-vs-bearish scenario analysis for {symbol}. "
-        "Focus on fundamentals, recent earnings trends, guidance, catalysts, risks. "
-        "Return ONLY JSON with keys: symbol, bullish_thesis, key_catalysts, target_price, target_horizon_days, bullish_probability, notes."
-    )
-    if custom_prompt:
-        base += "\nAdditional instructions: " + custom_prompt
-    return base
+def _api_json(future: Future, symbol: str) -> dict | list:
+    """
+    Parse the JSON reply of an API call queued for ``symbol``.
 
-
-def _format_top2_selection_prompt(perplexity_json_payloads: List[dict]) -> str:
-    return (
-        "You are screening stocks for near-term bullish potential. You will receive JSON analyses (one per stock).\n"
-        "Pick the two strongest bullish candidates using catalysts, probability, and upside.\n"
-        "Return ONLY JSON with this schema: {\"picks\":[{\"symbol\":str,\"reason\":str}],\"ranking\":[{\"symbol\":str,\"score\":number}]}.\n"
-        f"Analyses: {json.dumps(perplexity_json_payloads)[:12000]}"
-    )
-
-
-def _format_prediction_prompt(symbol: str) -> str:
-    return (
-        f"For {symbol}, predict a 30-day price target and percentage growth with probability bands.\n"
-        "Return ONLY JSON: {symbol, base_case_target, upside_target, downside_target, base_prob, upside_prob, downside_prob, assumptions}."
-    )
+    A call that failed is logged and yields ``{}``, so one symbol's error does not sink the others.
+    """
+    try:
+        resp = future.result()
+    except Exception as e:
+        logger.warning("Perplexity API call for %s failed: %s", symbol, e)
+        return {}
+    return extract_json_from_text(getattr(resp, "content", str(resp)) or "") or {}
 
 
 @dataclass
@@ -119,53 +89,113 @@ class StockEarningsCrewWorkflow:
             llm=self.chat.get_llm("reasoning"),
         )
 
+        # The prediction crew is built once; CrewAI fills {symbol} in from each kickoff's inputs
+        pred_task = Task(
+            description=format_prediction_prompt("{symbol}"),
+            expected_output="Strict JSON with price targets and probabilities",
+            agent=self.predictor,
+        )
+        self._pred_crew = Crew(tasks=[pred_task], agents=[self.predictor], process=Process.sequential)
+
+    def _select_top2(self, analyses: Dict[str, dict]) -> List[str]:
+        """Ask the selector agent (ChatGPT) for the two strongest bullish candidates."""
+        selector_task = Task(
+            description=format_top2_selection_prompt(list(analyses.values())),
+            expected_output="JSON with keys: picks (2 symbols with reasons), ranking (scored list)",
+            agent=self.selector,
+        )
+        crew = Crew(tasks=[selector_task], agents=[self.selector], process=Process.sequential)
+        sel_res = crew.kickoff({})
+        sel_json = extract_json_from_text(sel_res.tasks_output[0].raw) or {}
+        return [item.get("symbol") for item in (sel_json.get("picks") or []) if item.get("symbol")][:2]
+
+    def _predict_with_crew(self, symbol: str) -> dict | list:
+        """Ask the predictor agent (ChatGPT) for the symbol's price targets, reusing a cached answer."""
+        pred_prompt = format_prediction_prompt(symbol)
+        cached = cached_result(f"chatgpt:{symbol}", pred_prompt)
+        if cached is not None:
+            return cached
+        pred_res = self._pred_crew.kickoff({"symbol": symbol})
+        prediction = extract_json_from_text(pred_res.tasks_output[0].raw) or {}
+        cache_result(f"chatgpt:{symbol}", pred_prompt, prediction)
+        return prediction
+
     def run(self) -> Dict[str, Any]:
-        driver = start_persistent_browser()
-        try:
-            # Screener task (ChatGPT)
+        # Screener task (ChatGPT). Replies are cached for the process (see _stock_common),
+        # so reruns within the TTL skip calls already answered
+        earnings_prompt = format_earnings_query_prompt(self.state.weeks, self.state.desired_count)
+        earnings_json = cached_result("earnings", earnings_prompt)
+        if earnings_json is None:
             screener_task = Task(
-                description=_format_earnings_query_prompt(self.state.weeks),
+                description=earnings_prompt,
                 expected_output="JSON array of stocks with fields: symbol, company_name, earnings_date, market_cap_category",
                 agent=self.screener,
             )
             crew = Crew(tasks=[screener_task], agents=[self.screener], process=Process.sequential)
             res = crew.kickoff({})
             raw = res.tasks_output[0].raw
-            earnings_json = _extract_json_from_text(raw) or []
-
-            # Filter to mid/large and trim
-            cleaned: List[dict] = []
-            for item in earnings_json:
-                symbol = (item.get("symbol") or "").strip().upper()
-                cap = (item.get("market_cap_category") or "").strip().lower()
-                if not symbol:
-                    continue
-                if cap not in {"mid", "large"}:
-                    continue
-                cleaned.append({
-                    "symbol": symbol,
-                    "company_name": item.get("company_name"),
-                    "earnings_date": item.get("earnings_date"),
-                    "market_cap_category": cap,
-                })
-            self.state.earnings_list = cleaned[: self.state.desired_count]
-
-            # Perplexity analyses via browser (fallback to API)
-            analyses: Dict[str, dict] = {}
-            for row in self.state.earnings_list:
-                sym = row["symbol"]
-                prompt = _format_perplexity_bull_prompt(sym, self.state.custom_bull_prompt)
-                try:
-                    _, text = run_prompt_in_existing_tab(driver, Site.PERPLEXITY, prompt, 45)
-                    analysis = _extract_json_from_text(text or "") or {}
-                    if not analysis:
-                        api_resp = self.pplx_api.get_llm("reasoning").invoke(prompt)
-                        analysis = _extract_json_from_text(getattr(api_resp, "content", str(api_resp)) or "") or {}
-                except Exception as e:
-                    logger.warning("Perplexity browser error for %s: %s; using API fallback.", sym, e)
-                    api_resp = self.pplx_api.get_llm("reasoning").invoke(prompt)
-                    analysis = _extract_json_from_text(getattr(api_resp, "content", str(api_resp)) or "") or {}
+            earnings_json = extract_json_from_text(raw) or []
+            cache_result("earnings", earnings_prompt, earnings_json)
+
+        # Filter to mid/large and trim; the screener is asked for exactly that, so this is a safety net
+        cleaned: List[dict] = []
+        for item in earnings_json:
+            symbol = (item.get("symbol") or "").strip().upper()
+            cap = (item.get("market_cap_category") or "").strip().lower()
+            if not symbol:
+                continue
+            if cap not in {"mid", "large"}:
+                continue
+            cleaned.append({
+                "symbol": symbol,
+                "company_name": item.get("company_name"),
+                "earnings_date": item.get("earnings_date"),
+                "market_cap_category": cap,
+            })
+        self.state.earnings_list = cleaned[: self.state.desired_count]
+
+        if not self.state.earnings_list:
+            return {
+                "earnings_list": self.state.earnings_list,
+                "perplexity_analyses": {},
+                "error": "No mid/large cap candidates found from the earnings screener.",
+            }
+
+        # The browser is only started once there is something to analyse
+        driver = start_persistent_browser()
+        try:
+            # Perplexity analyses via browser (one tab, so serial). A symbol the browser fails on
+            # is queued to the API pool straight away, so its fallback overlaps the next symbols
+            pplx_llm = bounded_llm(self.pplx_api.get_llm("reasoning"), ANALYSIS_MAX_TOKENS)
+            bull_prompts = {
+                row["symbol"]: format_perplexity_bull_prompt(row["symbol"], self.state.custom_bull_prompt)
+                for row in self.state.earnings_list
+            }
+            raw_analyses: Dict[str, dict | list] = {}
+            with ThreadPoolExecutor(max_workers=API_CONCURRENCY) as api_pool:
+                api_futures: Dict[str, Future] = {}
+                for sym, prompt in bull_prompts.items():
+                    analysis = cached_result(sym, prompt)
+                    if analysis is None:
+                        try:
+                            _, text = run_prompt_in_existing_tab(driver, Site.PERPLEXITY, prompt, 45)
+                            analysis = extract_json_from_text(text or "") or {}
+                        except Exception as e:
+                            logger.warning("Perplexity browser error for %s: %s; using API fallback.", sym, e)
+                            analysis = {}
+                        if not analysis:
+                            api_futures[sym] = api_pool.submit(pplx_llm.invoke, prompt)
+                            continue
+                        cache_result(sym, prompt, analysis)
+                    raw_analyses[sym] = analysis
+
+                for sym, future in api_futures.items():
+                    raw_analyses[sym] = _api_json(future, sym)
+                    cache_result(sym, bull_prompts[sym], raw_analyses[sym])
 
+            analyses: Dict[str, dict] = {}
+            for sym in bull_prompts:
+                analysis = raw_analyses[sym]
                 if isinstance(analysis, dict):
                     prob = analysis.get("bullish_probability")
                     if isinstance(prob, (int, float)) and prob >= 0.5:
@@ -178,45 +208,41 @@ class StockEarningsCrewWorkflow:
                     "error": "No bullish candidates found.",
                 }
 
-            # Selection task (ChatGPT)
-            selection_prompt = _format_top2_selection_prompt(list(analyses.values()))
-            selector_task = Task(
-                description=selection_prompt,
-                expected_output="JSON with keys: picks (2 symbols with reasons), ranking (scored list)",
-                agent=self.selector,
-            )
-            crew = Crew(tasks=[selector_task], agents=[self.selector], process=Process.sequential)
-            sel_res = crew.kickoff({})
-            sel_json = _extract_json_from_text(sel_res.tasks_output[0].raw) or {}
-            top2 = [item.get("symbol") for item in (sel_json.get("picks") or []) if item.get("symbol")][:2]
+            # Selection task (ChatGPT); with two candidates or fewer there is nothing to rank
+            top2 = list(analyses) if len(analyses) <= 2 else self._select_top2(analyses)
             self.state.top2 = top2
 
-            # Predictions for top2
-            preds: Dict[str, Dict[str, Any]] = {}
-            for sym in top2:
-                pred_prompt = _format_prediction_prompt(sym)
-                # ChatGPT
-                pred_task = Task(
-                    description=pred_prompt,
-                    expected_output="Strict JSON with price targets and probabilities",
-                    agent=self.predictor,
-                )
-                crew = Crew(tasks=[pred_task], agents=[self.predictor], process=Process.sequential)
-                pred_res = crew.kickoff({})
-                gpt_json = _extract_json_from_text(pred_res.tasks_output[0].raw) or {}
-
-                # Perplexity via browser, fallback to API
-                try:
-                    _, p_text = run_prompt_in_existing_tab(driver, Site.PERPLEXITY, pred_prompt, 45)
-                    pplx_json = _extract_json_from_text(p_text or "") or {}
-                    if not pplx_json:
-                        p_api = self.pplx_api.get_llm("reasoning").invoke(pred_prompt)
-                        pplx_json = _extract_json_from_text(getattr(p_api, "content", str(p_api)) or "") or {}
-                except Exception:
-                    p_api = self.pplx_api.get_llm("reasoning").invoke(pred_prompt)
-                    pplx_json = _extract_json_from_text(getattr(p_api, "content", str(p_api)) or "") or {}
-
-                preds[sym] = {"chatgpt": gpt_json, "perplexity": pplx_json}
+            # Predictions for top2: the ChatGPT crew runs on a worker thread (one symbol at a
+            # time, it is a single crew) while the browser, which only works from this
+            # thread, handles Perplexity; API fallbacks run on their own threads
+            pplx_pred_llm = bounded_llm(self.pplx_api.get_llm("reasoning"), PREDICTION_MAX_TOKENS)
+            with ThreadPoolExecutor(max_workers=1) as crew_pool, ThreadPoolExecutor(max_workers=2) as api_pool:
+                gpt_futures = {sym: crew_pool.submit(self._predict_with_crew, sym) for sym in top2}
+                pplx_preds: Dict[str, dict | list] = {}
+                pplx_futures: Dict[str, Future] = {}
+                for sym in top2:
+                    pred_prompt = format_prediction_prompt(sym)
+                    cached = cached_result(f"perplexity:{sym}", pred_prompt)
+                    if cached is not None:
+                        pplx_preds[sym] = cached
+                        continue
+                    # Perplexity via browser, fallback to API
+                    try:
+                        _, p_text = run_prompt_in_existing_tab(driver, Site.PERPLEXITY, pred_prompt, 45)
+                        pplx_preds[sym] = extract_json_from_text(p_text or "") or {}
+                    except Exception:
+                        pass
+                    if not pplx_preds.get(sym):
+                        pplx_futures[sym] = api_pool.submit(pplx_pred_llm.invoke, pred_prompt)
+                    else:
+                        cache_result(f"perplexity:{sym}", pred_prompt, pplx_preds[sym])
+
+                for sym, future in pplx_futures.items():
+                    pplx_preds[sym] = _api_json(future, sym)
+                    cache_result(f"perplexity:{sym}", format_prediction_prompt(sym), pplx_preds[sym])
+                preds: Dict[str, Dict[str, Any]] = {
+                    sym: {"chatgpt": gpt_futures[sym].result(), "perplexity": pplx_preds[sym]} for sym in top2
+                }
 
             self.state.predictions = preds
             return {
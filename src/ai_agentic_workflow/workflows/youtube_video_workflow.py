@@ -13,6 +13,10 @@ from src.ai_agentic_workflow.clients.claude_client import DualModelClaudeClient
 
 logger = logging.getLogger(__name__)
 
+# The first number in a review is taken as its score
+_SCORE_RE = re.compile(r"(\d{1,3})")
+
+
 @dataclass
 class VideoProject:
     """Central state object passed between tasks."""
@@ -91,7 +95,21 @@ class YouTubeVideoWorkflow:
             llm=self.direction_client.get_llm(),
         )
 
-    def _story_task(self, idea: str) -> Task:
+        # Crews are built once and re-kicked each attempt; CrewAI fills the task
+        # descriptions from the kickoff inputs every time
+        self._initial_crew = self._crew(self._story_task(), self._review_task())
+        self._revise_crew = self._crew(self._enhance_task(), self._review_task())
+        self._direction_crew = self._crew(self._direction_task())
+
+    @staticmethod
+    def _crew(*tasks: Task) -> Crew:
+        return Crew(
+            tasks=list(tasks),
+            agents=[task.agent for task in tasks],
+            process=Process.sequential,
+        )
+
+    def _story_task(self) -> Task:
         return Task(
             description=(
                 "Write a 600-800 word inspirational wisdom story for adults based on the idea '{idea}'. "
@@ -134,7 +152,7 @@ class YouTubeVideoWorkflow:
     MAX_RETRIES = 3
 
     def _extract_score(self, review_output: str) -> int:
-        match = re.search(r"(\d{1,3})", review_output)
+        match = _SCORE_RE.search(review_output)
         return int(match.group(1)) if match else 0
 
     def run(self, idea: str) -> VideoProject:
@@ -145,17 +163,7 @@ class YouTubeVideoWorkflow:
 
         for attempt in range(1, self.MAX_RETRIES + 1):
             project.attempts = attempt
-            if current_story is None:
-                story_task = self._story_task(idea)
-            else:
-                story_task = self._enhance_task()
-
-            review_task = self._review_task()
-            crew = Crew(
-                tasks=[story_task, review_task],
-                agents=[story_task.agent, review_task.agent],
-                process=Process.sequential,
-            )
+            crew = self._initial_crew if current_story is None else self._revise_crew
 
             inputs = {
                 "idea": idea,
@@ -177,13 +185,7 @@ class YouTubeVideoWorkflow:
                 break
 
         # direction stage
-        direction_task = self._direction_task()
-        crew = Crew(
-            tasks=[direction_task],
-            agents=[direction_task.agent],
-            process=Process.sequential,
-        )
-        result = crew.kickoff({"story": current_story})
+        result = self._direction_crew.kickoff({"story": current_story})
         project.direction = result.tasks_output[0].raw
         return project
 
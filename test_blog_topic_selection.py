@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for topic selection in the blog creation workflow.
+
+Each of the user's technologies that appears in a topic adds to its score, including
+names nested in longer ones ("java" in "javascript"). No API calls are made.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+def _select(expertise_profile, trending_topics):
+    from src.ai_agentic_workflow.workflows.blog_creation_workflow import BlogCreationWorkflow
+
+    # select_best_topic needs no agents, so skip __init__ and its agent setup
+    workflow = BlogCreationWorkflow.__new__(BlogCreationWorkflow)
+    return workflow.select_best_topic(expertise_profile, trending_topics)
+
+
+def test_nested_technology_names():
+    """Technologies nested in longer names each count toward the score."""
+    print("Testing nested technology names...")
+    profile = {"technical_expertise": {"Java": 5, "JavaScript": 4, "React": 4, "React Native": 3}}
+    nested = {"topic": "JavaScript and React Native in 2025", "category": "Mobile", "engagement_score": 0}
+    popular = {"topic": "Java virtual threads", "category": "Backend", "engagement_score": 100}
+
+    # All four names match the nested topic (80), beating the popular one (50 + 20)
+    assert _select(profile, [popular, nested]) == nested
+    print("✅ Nested names all counted")
+
+
+def test_case_and_category():
+    """Matching ignores case and also looks at the topic's category."""
+    print("\nTesting case and category matching...")
+    profile = {"technical_expertise": {"Kubernetes": 5}}
+    by_category = {"topic": "Scaling stateful services", "category": "KUBERNETES", "engagement_score": 10}
+    other = {"topic": "Rust for embedded", "category": "Systems", "engagement_score": 40}
+
+    assert _select(profile, [other, by_category]) == by_category
+    assert _select({"technical_expertise": {}}, [by_category, other]) == other
+    print("✅ Case and category handled")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 70)
+    print("Blog Topic Selection - Tests")
+    print("=" * 70)
+
+    tests = [
+        ("Nested technology names", test_nested_technology_names),
+        ("Case and category", test_case_and_category),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            test_func()
+            results.append((name, True))
+        except Exception as e:
+            print(f"❌ {name} test failed: {e!r}")
+            results.append((name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'}: {name}")
+    print(f"\nTotal: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
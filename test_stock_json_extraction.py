@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test script for JSON extraction in the stock earnings workflows.
+
+Perplexity replies cite their sources with bracketed marks such as [1], which must
+not be mistaken for the JSON payload. No API calls are made.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+class _StreamingLLM:
+    """Yields a fixed reply in small chunks, like a streaming chat model."""
+
+    def __init__(self, reply: str, chunk_size: int = 3):
+        self.reply = reply
+        self.chunk_size = chunk_size
+
+    def stream(self, prompt):
+        for i in range(0, len(self.reply), self.chunk_size):
+            yield SimpleNamespace(content=self.reply[i:i + self.chunk_size])
+
+
+class _FlakyStreamingLLM(_StreamingLLM):
+    """Raises ``error`` for the first ``failures`` streams, before yielding any chunk."""
+
+    def __init__(self, reply: str, error: Exception, failures: int = 1):
+        super().__init__(reply)
+        self.error = error
+        self.failures = failures
+        self.calls = 0
+
+    def stream(self, prompt):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        yield from super().stream(prompt)
+
+
+def test_citation_prefixed_text():
+    """Citation marks before the payload are skipped."""
+    print("Testing citation-prefixed replies...")
+    from src.ai_agentic_workflow.workflows._stock_common import extract_json_from_text
+
+    cases = [
+        ('text [1] then {"a":[1,2]} trailing', {"a": [1, 2]}),
+        (
+            'AAPL beat estimates [1][2]. Outlook [3]:\n{"symbol": "AAPL", "bullish_probability": 0.7} [4]',
+            {"symbol": "AAPL", "bullish_probability": 0.7},
+        ),
+        ('Sources [1], [2]\n```json\n{"symbol": "MSFT"}\n```', {"symbol": "MSFT"}),
+        ('[1] [2] [{"symbol": "A"}, {"symbol": "B"}]', [{"symbol": "A"}, {"symbol": "B"}]),
+        ('See [1]: {"notes": "brackets ] and [ inside a string"}', {"notes": "brackets ] and [ inside a string"}),
+    ]
+    for text, expected in cases:
+        assert extract_json_from_text(text) == expected, text
+        print(f"✅ Parsed: {text[:30]}...")
+
+
+def test_citations_without_payload():
+    """A reply holding only citation marks yields nothing, so callers fall back to the API."""
+    print("\nTesting replies without a payload...")
+    from src.ai_agentic_workflow.workflows._stock_common import extract_json_from_text
+
+    assert extract_json_from_text("Only citations [1][2] and no JSON") is None
+    assert extract_json_from_text("") is None
+    print("✅ No payload found")
+
+
+def test_stream_json_skips_citations():
+    """Streamed replies skip citation marks that start a line."""
+    print("\nTesting streamed replies...")
+    from src.ai_agentic_workflow.workflows._stock_common import stream_json
+
+    assert stream_json(_StreamingLLM('[1]\n{"symbol": "NVDA"}\nmore text'), "prompt") == {"symbol": "NVDA"}
+    assert stream_json(_StreamingLLM('Sources:\n[1]\n[2] then [{"symbol": "A"}]'), "prompt") == [{"symbol": "A"}]
+    print("✅ Streamed payloads found")
+
+
+def test_stream_json_retries_before_first_chunk():
+    """Transient API errors before the reply starts are retried, as ``invoke`` is."""
+    print("\nTesting streamed retries...")
+    import httpx
+    import openai
+    from src.ai_agentic_workflow.workflows import _stock_common
+
+    error = openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+    sleep = _stock_common.time.sleep
+    _stock_common.time.sleep = lambda seconds: None
+    try:
+        llm = _FlakyStreamingLLM('{"symbol": "AMD"}', error, failures=_stock_common.LLM_MAX_ATTEMPTS - 1)
+        assert _stock_common.stream_json(llm, "prompt") == {"symbol": "AMD"}
+        assert llm.calls == _stock_common.LLM_MAX_ATTEMPTS
+
+        llm = _FlakyStreamingLLM('{"symbol": "AMD"}', error, failures=_stock_common.LLM_MAX_ATTEMPTS)
+        try:
+            _stock_common.stream_json(llm, "prompt")
+        except openai.APIConnectionError:
+            pass
+        else:
+            raise AssertionError("expected the last attempt's error")
+        assert llm.calls == _stock_common.LLM_MAX_ATTEMPTS
+
+        llm = _FlakyStreamingLLM('{"symbol": "AMD"}', ValueError("bad request"))
+        try:
+            _stock_common.stream_json(llm, "prompt")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected a non-transient error to propagate")
+        assert llm.calls == 1
+    finally:
+        _stock_common.time.sleep = sleep
+    print("✅ Transient errors retried")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 70)
+    print("Stock Workflow JSON Extraction - Tests")
+    print("=" * 70)
+
+    tests = [
+        ("Citation-prefixed text", test_citation_prefixed_text),
+        ("Citations without payload", test_citations_without_payload),
+        ("Streamed replies", test_stream_json_skips_citations),
+        ("Streamed retries", test_stream_json_retries_before_first_chunk),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            test_func()
+            results.append((name, True))
+        except Exception as e:
+            print(f"❌ {name} test failed: {e!r}")
+            results.append((name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'}: {name}")
+    print(f"\nTotal: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())